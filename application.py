@@ -1,20 +1,25 @@
 import asyncio
+import itertools
 import random
+import sys
+import time
 
-from typing import List, Any, Set, Optional, Callable
+from datetime import datetime, timezone
+from typing import List, Any, Set, Optional
 from loguru import logger
 
 from core.modules.executor import ModuleExecutor
-from loader import config, file_operations, semaphore, proxy_manager
+from loader import config, file_operations, semaphore, proxy_manager, proxy_checker, signing_service, metrics_server, captcha_pool
 from models import Account
-from utils import Progress
+from utils import Progress, LiveDashboard, RuntimeProfiler, registry, tracer, accounts_active, accounts_parked, accounts_completed_total, semaphore_in_use
 from console import Console
-from database import initialize_database, Accounts
+from database import initialize_database, close_database, write_behind, Accounts, Runs, TaskExecutions
 
 
 class ApplicationManager:
     def __init__(self):
         self.accounts_with_initial_delay: Set[str] = set()
+        self.profiler = RuntimeProfiler(**vars(config.profiling_settings))
         self.module_map = {
             "request_tokens_from_faucet": (config.accounts_to_request_tokens, self._execute_module_for_accounts),
             "top_up_game_balance": (config.accounts_to_top_up_game_balance, self._execute_module_for_accounts),
@@ -22,35 +27,175 @@ class ApplicationManager:
             "mint_omnihub_nft": (config.accounts_to_mint_nft, self._execute_module_for_accounts),
             "all_in_one": (config.accounts_for_all_in_one, self._execute_module_for_accounts),
         }
+        self.maintenance_map = {
+            "clean_accounts_proxies": self._clean_accounts_proxies,
+            "reassign_accounts_proxies": self._reassign_accounts_proxies,
+            "release_dead_proxies": self._release_dead_proxies,
+            "run_statistics": self._show_run_statistics,
+        }
 
-    @staticmethod
-    async def initialize() -> None:
+    async def initialize(self) -> None:
         logger.info(f"Initializing database..")
         await initialize_database()
         logger.success(f"Database initialized")
         await file_operations.setup_files()
+        self.profiler.start()
+
+        tracer.configure(
+            enabled=config.tracing_settings.enabled,
+            sample_rate=config.tracing_settings.sample_rate,
+            max_events=config.tracing_settings.max_events,
+        )
+
+        if config.metrics_settings.enabled:
+            try:
+                await metrics_server.start()
+            except OSError as e:
+                logger.error(f"Unable to start metrics server: {str(e)}")
+
+    async def shutdown(self) -> None:
+        await self.profiler.stop()
+        await metrics_server.stop()
+        if config.metrics_settings.dump_file:
+            try:
+                registry.dump(config.metrics_settings.dump_file)
+            except OSError as e:
+                logger.error(f"Unable to write metrics to {config.metrics_settings.dump_file}: {str(e)}")
+
+        if tracer.enabled:
+            try:
+                tracer.dump(config.tracing_settings.output_file)
+                logger.info(f"Trace with {tracer.events_count} events saved to {config.tracing_settings.output_file}")
+            except OSError as e:
+                logger.error(f"Unable to write trace to {config.tracing_settings.output_file}: {str(e)}")
+
+        await signing_service.shutdown()
+        await file_operations.close()
+        await close_database()
 
     async def _execute_module_for_accounts(
         self, accounts: List[Account], module_name: str
     ) -> list[Any]:
-        progress = Progress(len(accounts))
+        progress = Progress(len(accounts), window=config.dashboard_settings.throughput_window)
 
         if module_name == "export_stats":
             await file_operations.setup_stats()
 
+        db_accounts = await self._preload_accounts(accounts)
+        run = await self._start_run(module_name, len(accounts))
+
         tasks = []
         for account in accounts:
-            executor = ModuleExecutor(account)
-            module_func = getattr(executor, f"_process_{module_name}")
-            tasks.append(self._safe_execute_module(account, module_func, progress))
+            executor = ModuleExecutor(account, db_accounts.get(account.wallet_address), run.id if run else None)
+            tasks.append(self._safe_execute_module(account, executor, module_name, progress, run))
+
+        dashboard = self._create_dashboard(progress, module_name)
+        if dashboard is not None:
+            await dashboard.start()
+
+        if captcha_pool is not None and self._uses_faucet(module_name):
+            captcha_pool.start(consumers=len(accounts))
+
+        try:
+            return await asyncio.gather(*tasks)
+        finally:
+            if captcha_pool is not None:
+                await captcha_pool.stop()
+
+            if dashboard is not None:
+                await dashboard.stop()
+
+            # Maintenance modules run straight on the database, queued updates must land first
+            await write_behind.flush()
+            logger.debug(f"Database write-behind stats: {write_behind.stats()}")
+
+            if module_name == "export_stats":
+                await file_operations.finalize_stats()
+
+            if config.results_settings.rollup == "csv":
+                await file_operations.rollup_records()
+
+            if run is not None:
+                await run.finish_run()
+
+    @staticmethod
+    def _uses_faucet(module_name: str) -> bool:
+        return module_name == "request_tokens_from_faucet" or (
+            module_name == "all_in_one" and "faucet" in config.all_in_one_settings.tasks_to_perform
+        )
+
+    @staticmethod
+    def _create_dashboard(progress: Progress, module_name: str) -> Optional[LiveDashboard]:
+        if not config.dashboard_settings.enabled:
+            return None
 
-        return await asyncio.gather(*tasks)
+        return LiveDashboard(
+            progress,
+            title=module_name,
+            interactive=not config.headless and sys.stdout.isatty(),
+            refresh_interval=config.dashboard_settings.refresh_interval,
+            summary_interval=config.dashboard_settings.summary_interval,
+            top_errors=config.dashboard_settings.top_errors,
+        )
+
+    @staticmethod
+    async def _start_run(module_name: str, accounts_count: int) -> Optional[Runs]:
+        try:
+            return await Runs.start_run(module=module_name, accounts_count=accounts_count)
+        except Exception as e:
+            logger.error(f"Error while creating run history entry, task results will not be saved: {str(e)}")
+            return None
+
+    @staticmethod
+    def _record_task_reports(run: Optional[Runs], module_name: str, executor: ModuleExecutor) -> None:
+        if run is None:
+            return
+
+        for report in executor.bot.reports:
+            write_behind.insert(TaskExecutions.from_report(run, module_name, report))
+
+    @staticmethod
+    async def _preload_accounts(accounts: List[Account]) -> dict[str, Accounts]:
+        logger.info(f"Loading {len(accounts)} accounts from database..")
+        started = time.monotonic()
+
+        try:
+            db_accounts = await Accounts.preload_accounts(
+                private_keys={account.wallet_address: account.private_key for account in accounts},
+                # Stored proxies are only claimed through affinity, otherwise they are leased on demand
+                proxies=list(proxy_manager.health) if config.proxy_settings.proxy_affinity else None,
+            )
+        except Exception as e:
+            logger.error(f"Error while preloading accounts, they will be loaded one by one: {str(e)}")
+            return {}
+
+        logger.success(f"Loaded {len(db_accounts)} accounts in {time.monotonic() - started:.2f}s")
+        return db_accounts
 
     async def _safe_execute_module(
-            self, account: Account, module_func: Callable, progress: Progress
+            self, account: Account, executor: ModuleExecutor, module_name: str, progress: Progress, run: Optional[Runs] = None
+    ) -> Optional[dict]:
+        try:
+            with tracer.trace(account.wallet_address, module_name):
+                return await self._execute_account(account, executor, module_name, progress, run)
+        finally:
+            # An account that failed before its faucet step will not ask for a token either
+            if captcha_pool is not None:
+                captcha_pool.consumer_done(account.wallet_address)
+
+    async def _execute_account(
+            self, account: Account, executor: ModuleExecutor, module_name: str, progress: Progress, run: Optional[Runs] = None
     ) -> Optional[dict]:
+        module_func = getattr(executor, f"_process_{module_name}")
+        holds_semaphore = False
+        queued_at = time.monotonic()
+
         try:
             async with semaphore:
+                semaphore_in_use.inc()
+                holds_semaphore = True
+                tracer.add_span("semaphore_wait", "queue", queued_at, time.monotonic() - queued_at)
+
                 if (
                     config.attempts_and_delay_settings.delay_before_start.min > 0
                     and config.attempts_and_delay_settings.delay_before_start.max > 0
@@ -64,53 +209,190 @@ class ApplicationManager:
                             f"Account: {account.wallet_address} | Initial delay set to {random_delay} seconds | Execution will start in {random_delay} seconds"
                         )
                         self.accounts_with_initial_delay.add(account.wallet_address)
-                        await asyncio.sleep(random_delay)
+                        accounts_parked.inc()
+                        try:
+                            with tracer.span("initial_delay", "delay", seconds=random_delay):
+                                await asyncio.sleep(random_delay)
+                        finally:
+                            accounts_parked.dec()
 
-                result = await module_func()
-                if module_func.__name__ != "_process_farm":
-                    progress.increment()
-                    logger.debug(f"Progress: {progress.processed}/{progress.total}")
+                accounts_active.inc()
+                try:
+                    result = await module_func()
+                finally:
+                    accounts_active.dec()
 
+                accounts_completed_total.inc(module=module_name)
+                progress.record(executor.bot.reports)
                 return result
 
         except Exception as e:
             logger.error(f"Error processing account {account.wallet_address}: {str(e)}")
+            progress.record(executor.bot.reports, error=e)
             return {"success": False, "error": str(e)}
 
+        finally:
+            if holds_semaphore:
+                semaphore_in_use.dec()
+
+            await executor.cleanup()
+            self._record_task_reports(run, module_name, executor)
+
+
+    @staticmethod
+    async def _load_proxies() -> None:
+        if not config.proxy_settings.preflight_check:
+            proxy_manager.load_proxy(config.proxies)
+            return
+
+        verdicts = await proxy_checker.check(config.proxies)
+        if not verdicts and config.proxies:
+            logger.error("No working proxies found, please check your proxies and restart the application")
+
+        proxy_manager.load_proxy(list(verdicts))
+        for proxy, verdict in verdicts.items():
+            proxy_manager.report(proxy, True, verdict.handshake_time)
 
     @staticmethod
     async def _clean_accounts_proxies() -> None:
         logger.info("Cleaning all accounts proxies..")
+        started = time.monotonic()
+
         try:
-            cleared_count = await Accounts().clear_all_accounts_proxies()
-            logger.success(f"Successfully cleared proxies for {cleared_count} accounts")
+            cleared_count = await Accounts.clear_all_accounts_proxies()
+            logger.success(
+                f"Successfully cleared proxies for {cleared_count} accounts in {time.monotonic() - started:.2f}s"
+            )
 
         except Exception as e:
             logger.error(f"Error while clearing accounts proxies: {str(e)}")
 
+    async def _reassign_accounts_proxies(self) -> None:
+        await self._load_proxies()
+        proxies = list(proxy_manager.health)
+        if not proxies:
+            logger.error("No proxies to assign")
+            return
+
+        logger.info(f"Reassigning {len(proxies)} proxies between accounts..")
+        started = time.monotonic()
+
+        try:
+            wallet_addresses = await Accounts.get_wallet_addresses()
+            proxy_cycle = itertools.cycle(proxies)
+            updated_count = await Accounts.reassign_proxies(
+                {wallet_address: next(proxy_cycle) for wallet_address in wallet_addresses}
+            )
+            logger.success(
+                f"Successfully reassigned proxies for {updated_count} accounts in {time.monotonic() - started:.2f}s"
+            )
+
+        except Exception as e:
+            logger.error(f"Error while reassigning accounts proxies: {str(e)}")
+
+    @staticmethod
+    async def _release_dead_proxies() -> None:
+        logger.info("Looking for dead proxies assigned to accounts..")
+        started = time.monotonic()
+
+        try:
+            used_proxies = await Accounts.get_used_proxies()
+            # Proxies removed from the proxies file are released together with the ones failing the check
+            known_proxies = set(config.proxies)
+            working = await proxy_checker.check([proxy for proxy in used_proxies if proxy in known_proxies])
+            dead_proxies = [proxy for proxy in used_proxies if proxy not in working]
+
+            if not dead_proxies:
+                logger.success("No dead proxies are assigned to accounts")
+                return
+
+            released_count = await Accounts.release_proxies(dead_proxies)
+            logger.success(
+                f"Released {len(dead_proxies)} dead proxies from {released_count} accounts in {time.monotonic() - started:.2f}s"
+            )
+
+        except Exception as e:
+            logger.error(f"Error while releasing dead proxies: {str(e)}")
+
+    @staticmethod
+    async def _show_run_statistics() -> None:
+        logger.info("Loading run statistics..")
+        started = time.monotonic()
+
+        try:
+            runs = await Runs.get_latest_runs()
+            if not runs:
+                logger.info("No runs recorded yet")
+                return
+
+            for run in runs:
+                summary = await TaskExecutions.get_run_summary(run.id)
+                total = sum(row["count"] for row in summary)
+                finished_at = run.finished_at or datetime.now(timezone.utc)
+                elapsed = max((finished_at - run.started_at).total_seconds(), 1.0)
+
+                logger.info(
+                    f"Run #{run.id} | Module: {run.module} | Status: {run.status} | "
+                    f"Started: {run.started_at:%Y-%m-%d %H:%M:%S} | Accounts: {run.accounts_count} | "
+                    f"Tasks: {total} | Throughput: {total / elapsed * 60:.2f} tasks/min"
+                )
+
+                statuses: dict[str, dict[str, int]] = {}
+                for row in summary:
+                    statuses.setdefault(row["task"], {})[row["status"]] = row["count"]
+
+                for task, counts in statuses.items():
+                    stages = []
+                    for stage in ("captcha_time", "rpc_time", "duration"):
+                        percentiles = await TaskExecutions.get_stage_percentiles(run.id, task, stage, count=sum(counts.values()))
+                        stages.append(
+                            f"{stage}: " + " / ".join(f"p{int(q * 100)} {value:.2f}s" for q, value in percentiles.items())
+                        )
+
+                    logger.info(
+                        f"Run #{run.id} | Task: {task} | "
+                        + ", ".join(f"{status}: {count}" for status, count in counts.items())
+                        + " | " + " | ".join(stages)
+                    )
+
+            logger.success(f"Run statistics loaded in {time.monotonic() - started:.2f}s")
+
+        except Exception as e:
+            logger.error(f"Error while loading run statistics: {str(e)}")
+
+    @staticmethod
+    def _pause() -> None:
+        if not config.headless:
+            input("\nPress Enter to continue...")
+
     async def run(self) -> None:
         while True:
-            await Console().build()
+            if not config.headless:
+                await Console().build()
 
-            if config.module == "clean_accounts_proxies":
-                await self._clean_accounts_proxies()
-                input("\nPress Enter to continue...")
-                continue
+            if config.module in self.maintenance_map:
+                with self.profiler.module_run(config.module):
+                    await self.maintenance_map[config.module]()
 
-            if config.module not in self.module_map:
+            elif config.module not in self.module_map:
                 logger.error(f"Unknown module: {config.module}")
                 break
 
-            proxy_manager.load_proxy(config.proxies)
-            accounts, process_func = self.module_map[config.module]
+            else:
+                accounts, process_func = self.module_map[config.module]
 
-            if config.application_settings.shuffle_accounts:
-                random.shuffle(accounts)
+                if config.application_settings.shuffle_accounts:
+                    random.shuffle(accounts)
 
-            if not accounts:
-                logger.error(f"No accounts for {config.module}")
-                input("\nPress Enter to continue...")
-                continue
+                if accounts:
+                    await self._load_proxies()
+                    with self.profiler.module_run(config.module):
+                        await self._execute_module_for_accounts(accounts, config.module)
+                else:
+                    logger.error(f"No accounts for {config.module}")
 
-            await self._execute_module_for_accounts(accounts, config.module)
-            input("\nPress Enter to continue...")
+            # Headless runs execute the selected module once and exit
+            if config.headless:
+                break
+
+            self._pause()
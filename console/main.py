@@ -30,6 +30,9 @@ class Console:
         "📥 Mint OmniHub NFT",
         "",
         "🧹 Clean accounts proxies",
+        "🔄 Reassign accounts proxies",
+        "🚫 Release dead proxies",
+        "📊 Run statistics",
         "❌ Exit",
     )
     MODULES_DATA = {
@@ -39,6 +42,9 @@ class Console:
         "🎮 Play games": "play_games",
         "📥 Mint OmniHub NFT": "mint_omnihub_nft",
         "🧹 Clean accounts proxies": "clean_accounts_proxies",
+        "🔄 Reassign accounts proxies": "reassign_accounts_proxies",
+        "🚫 Release dead proxies": "release_dead_proxies",
+        "📊 Run statistics": "run_statistics",
         "❌ Exit": "exit",
     }
 
@@ -1,17 +1,24 @@
 import asyncio
 import json
+import time
 
 from typing import Literal
+from urllib.parse import urlsplit
 
 from curl_cffi.requests import AsyncSession, Response
 
 from models import GameType
 from core.exceptions.base import APIError, ServerError, ProxyForbidden, RateLimitExceeded
+from utils.managers.proxy_manager import ProxyManager
+from utils.monitoring.metrics import http_request_seconds, retries_total
+from utils.monitoring.tracing import tracer
+from utils.processing.reports import add_stage_time
 
 
 class APIClient:
-    def __init__(self, proxy: str = None):
+    def __init__(self, proxy: str = None, proxy_manager: ProxyManager = None):
         self.proxy = proxy
+        self.proxy_manager = proxy_manager
         self.session = self._create_session()
         self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
 
@@ -47,6 +54,10 @@ class APIClient:
                         f"API returned an error: {response_data}", response_data
                     )
 
+    def _report_proxy(self, success: bool, latency: float = None) -> None:
+        if self.proxy and self.proxy_manager:
+            self.proxy_manager.report(self.proxy, success, latency)
+
     async def close_session(self) -> None:
         try:
             await self.session.close()
@@ -65,8 +76,10 @@ class APIClient:
         max_retries: int = 2,
         retry_delay: float = 3.0,
     ) -> dict | Response:
+        host = urlsplit(url).netloc
         for attempt in range(max_retries):
             try:
+                response, started = None, time.monotonic()
                 if request_type == "POST":
                     response = await self.session.post(
                         url,
@@ -99,6 +112,14 @@ class APIClient:
                         cookies=cookies,
                     )
 
+                # Any answer means the proxy did its job, except the proxy's own 403 page
+                proxy_forbidden = response.status_code == 403 and "403 Forbidden" in response.text
+                latency = time.monotonic() - started
+                self._report_proxy(not proxy_forbidden, latency)
+                add_stage_time("api", latency)
+                http_request_seconds.observe(latency, host=host, status=response.status_code)
+                tracer.add_span("http", "api", started, latency, url=url, status=response.status_code)
+
                 if verify:
                     if response.headers.get("ratelimit-remaining") and response.headers.get("ratelimit-reset"):
                         reset_time = int(response.headers.get("ratelimit-reset"))
@@ -106,7 +127,7 @@ class APIClient:
                         if remaining in [0, 1]:
                             raise RateLimitExceeded(reset_time)
 
-                    if response.status_code == 403 and "403 Forbidden" in response.text:
+                    if proxy_forbidden:
                         raise ProxyForbidden(f"Proxy forbidden - {response.status_code}")
 
                     elif response.status_code == 403:
@@ -130,24 +151,36 @@ class APIClient:
             except ServerError as error:
                 if attempt == max_retries - 1:
                     raise error
+                retries_total.inc(task="api_request")
                 await asyncio.sleep(retry_delay)
 
             except (APIError, ProxyForbidden, RateLimitExceeded):
                 raise
 
             except Exception as error:
+                if response is None:
+                    latency = time.monotonic() - started
+                    self._report_proxy(False)
+                    add_stage_time("api", latency)
+                    http_request_seconds.observe(latency, host=host, status="error")
+                    tracer.add_span("http", "api", started, latency, url=url, error=type(error).__name__)
+
                 if attempt == max_retries - 1:
                     raise Exception(
                         f"Failed to send request after {max_retries} attempts: {error}"
                     )
+                retries_total.inc(task="api_request")
                 await asyncio.sleep(retry_delay)
 
         raise Exception(f"Failed to send request after {max_retries} attempts")
 
 
 class IrysAPI(APIClient):
-    def __init__(self, proxy: str = None, auth_token: str = None):
-        super().__init__(proxy)
+    FAUCET_SITE_KEY = "0x4AAAAAAA6vnrvBCtS4FAl-"
+    FAUCET_PAGE_URL = "https://irys.xyz/faucet"
+
+    def __init__(self, proxy: str = None, auth_token: str = None, proxy_manager: ProxyManager = None):
+        super().__init__(proxy, proxy_manager)
         self.auth_token = auth_token
 
 
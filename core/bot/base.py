@@ -5,84 +5,139 @@ import time
 from typing import Literal, Optional
 
 from loguru import logger
-from better_proxy import Proxy
 
 from core.onchain.wallet import Web3Wallet
-from loader import config, file_operations, proxy_manager, captcha_solver
+from loader import config, file_operations, proxy_manager, captcha_solver, captcha_pool, signing_service, rpc_pool, semaphore
 from models import Account, OperationResult, GameType
-from database import Accounts
+from database import Accounts, AccountQueries, AccountRow
 from core.api.irys import IrysAPI
 from core.exceptions.base import (
     APIError,
     CaptchaSolvingFailed, APIErrorType
 )
+from core.exceptions.classifier import ErrorCause, ErrorClass, classify_error
 from utils import (
     operation_failed, operation_success,
     validate_error, generate_session_id,
-    generate_anti_cheat_hash, generate_sprite_game_stats
+    generate_anti_cheat_hash, generate_sprite_game_stats,
+    TaskReport, reported_task, add_stage_time,
+    note_attempt, note_error, note_tx_hash,
+    accounts_parked, proxy_rotations_total, tracer
 )
 from core.onchain import IrysGamesModule, IrysOmnihubModule
 
 
 class Bot:
-    def __init__(self, account_data: Account = None):
+    def __init__(self, account_data: Account = None, db_account: Accounts = None):
         self.account_data = account_data
-        self._db_account: Optional[Accounts] = None
+        self._preloaded_account = db_account
+        self._db_account: Optional[Accounts | AccountRow] = None
+        self._leased_proxy: Optional[str] = None
+        self.reports: list[TaskReport] = []
 
-    async def _ensure_db_account(self) -> Accounts:
+    async def _ensure_db_account(self) -> Accounts | AccountRow:
         if self._db_account is not None:
             return self._db_account
 
         wallet = self.account_data.wallet_address
-        db_account = await Accounts.get_account(wallet_address=wallet)
+        db_account = self._preloaded_account or await AccountQueries.get_by_wallet(wallet)
 
         if db_account is None:
             proxy = await self._prepare_proxy()
 
-            db_account = await Accounts.create_account(
+            db_account = await AccountQueries.upsert(
                 wallet_address=wallet,
                 private_key=self.account_data.private_key,
                 active_account_proxy=proxy,
             )
 
-        if not db_account.active_account_proxy:
+        elif not db_account.active_account_proxy or not self._claim_stored_proxy(db_account.active_account_proxy):
             proxy = await self._prepare_proxy()
             await db_account.update_account(active_account_proxy=proxy)
 
         self._db_account = db_account
         return db_account
 
+    def _claim_stored_proxy(self, proxy: str) -> bool:
+        # Without affinity every run leases a fresh proxy, so the lease caps and uniqueness always apply
+        if not config.proxy_settings.proxy_affinity:
+            return False
+
+        if proxy_manager.lease(proxy):
+            self._leased_proxy = proxy
+            return True
+
+        logger.info("Account: {} | Stored proxy is unavailable or unhealthy | Assigning a new one..", self.account_data.wallet_address)
+        return False
+
+    async def _prepare_proxy(self) -> str:
+        await self.release_proxy()
+        self._leased_proxy = await proxy_manager.get_proxy()
+        return self._leased_proxy
+
+    async def release_proxy(self) -> None:
+        if self._leased_proxy:
+            await proxy_manager.release_proxy(self._leased_proxy)
+            self._leased_proxy = None
+
     @staticmethod
-    async def _prepare_proxy() -> str:
-        proxy = await proxy_manager.get_proxy()
-        return proxy.as_url if isinstance(proxy, Proxy) else proxy
+    async def _sleep(delay: float) -> None:
+        accounts_parked.inc()
+        try:
+            with tracer.span("sleep", "delay", seconds=delay):
+                await asyncio.sleep(delay)
+        finally:
+            accounts_parked.dec()
 
-    async def _update_account_proxy(self, attempt: int, max_attempts: int) -> None:
-        error_delay = config.attempts_and_delay_settings.error_delay
+    @staticmethod
+    def _note_error(error: Exception) -> None:
+        note_error(error)
 
-        if config.application_settings.disable_auto_proxy_change is False:
-            if self._db_account and self._db_account.active_account_proxy:
-                await proxy_manager.release_proxy(self._db_account.active_account_proxy)
+        # Only errors caused by load feed the adaptive concurrency limit, a reverted transaction does not
+        error_class = classify_error(error)
+        if error_class.cause in (ErrorCause.PROXY, ErrorCause.SERVER, ErrorCause.RATE_LIMIT):
+            semaphore.record_error(error_class.name)
+
+    async def _update_account_proxy(self, attempt: int, max_attempts: int, error_class: ErrorClass = None) -> None:
+        # Without a classified error the proxy is always replaced, as for an invalid captcha
+        error_delay = config.attempts_and_delay_settings.error_delay
+        if error_class is not None and error_class.backoff is not None:
+            error_delay = error_class.backoff
 
+        if error_class is not None and not error_class.rotate_proxy:
+            msg = f"Proxy kept ({error_class.cause.value} error)"
+        elif config.application_settings.disable_auto_proxy_change is False:
             if not self._db_account:
                 logger.info(
-                    f"Account: {self.account_data.wallet_address} | Proxy changed | "
-                    f"Retrying in {error_delay}s.. | Attempt: {min(attempt + 1, max_attempts)}/{max_attempts}.."
+                    "Account: {} | Proxy changed | Retrying in {}s.. | Attempt: {}/{}..",
+                    self.account_data.wallet_address, error_delay, min(attempt + 1, max_attempts), max_attempts,
                 )
-                await asyncio.sleep(error_delay)
+                await self._sleep(error_delay)
                 return
 
             proxy = await self._prepare_proxy()
             await self._db_account.update_account_proxy(proxy)
+            proxy_rotations_total.inc()
             msg = "Proxy changed"
         else:
             msg = "Proxy change disabled"
 
         logger.info(
-            f"Account: {self.account_data.wallet_address} | {msg} | "
-            f"Retrying in {error_delay}s.. | Attempt: {min(attempt + 1, max_attempts)}/{max_attempts}.."
+            "Account: {} | {} | Retrying in {}s.. | Attempt: {}/{}..",
+            self.account_data.wallet_address, msg, error_delay, min(attempt + 1, max_attempts), max_attempts,
         )
-        await asyncio.sleep(error_delay)
+        await self._sleep(error_delay)
+
+    @staticmethod
+    def _web3_params(db_account_value: Accounts) -> dict:
+        return {
+            "private_key": db_account_value.private_key,
+            "rpc_url": config.web3_settings.irys_rpc_url,
+            "proxy": db_account_value.active_account_proxy,
+            "signer": signing_service,
+            "rpc_pool": rpc_pool,
+            "proxy_manager": proxy_manager,
+        }
 
     @staticmethod
     def tx_hash_to_explorer_link(tx_hash: str) -> str:
@@ -96,21 +151,21 @@ class Bot:
         max_attempts = config.attempts_and_delay_settings.max_captcha_attempts
 
         async def handle_turnistale() -> Optional[str]:
-            logger.info(f"Account: {wallet_address} | Solving Cloudflare captcha | Attempt: {attempt + 1}/{max_attempts}")
+            logger.info("Account: {} | Solving Cloudflare captcha | Attempt: {}/{}", wallet_address, attempt + 1, max_attempts)
 
             success, result = await captcha_solver.solve_turnistale(
-                site_key="0x4AAAAAAA6vnrvBCtS4FAl-",
-                page_url="https://irys.xyz/faucet"
+                site_key=IrysAPI.FAUCET_SITE_KEY,
+                page_url=IrysAPI.FAUCET_PAGE_URL
             )
 
             if success:
-                logger.success(f"Account: {wallet_address} | Cloudflare captcha solved")
+                logger.success("Account: {} | Cloudflare captcha solved", wallet_address)
                 return result
 
             raise ValueError(f"{result}")
 
         async def handle_geetest() -> Optional[str]:
-            logger.info(f"Account: {wallet_address} | Solving Geetest captcha | Attempt: {attempt + 1}/{max_attempts}")
+            logger.info("Account: {} | Solving Geetest captcha | Attempt: {}/{}", wallet_address, attempt + 1, max_attempts)
 
             success, result = await captcha_solver.solve_geetest(
                 page_url="https://app.galxe.com/quest",
@@ -125,12 +180,23 @@ class Bot:
             )
 
             if success:
-                logger.success(f"Account: {wallet_address} | Geetest captcha solved")
+                logger.success("Account: {} | Geetest captcha solved", wallet_address)
                 return result
 
             raise ValueError(f"{result}")
 
+        if captcha_type == "cf" and captcha_pool is not None and captcha_pool.running:
+            started = time.monotonic()
+            token = await captcha_pool.get(timeout=config.captcha_settings.max_captcha_solving_time)
+            add_stage_time("captcha", time.monotonic() - started)
+
+            if token:
+                logger.success("Account: {} | Cloudflare captcha token taken from the prefetch pool", wallet_address)
+                return token
+
         for attempt in range(max_attempts):
+            started = time.monotonic()
+
             try:
                 if captcha_type == "geetest":
                     if not action:
@@ -144,7 +210,10 @@ class Bot:
                 )
                 if attempt == max_attempts - 1:
                     raise CaptchaSolvingFailed(f"Failed to solve Cloudflare after {max_attempts} attempts")
+            finally:
+                add_stage_time("captcha", time.monotonic() - started)
 
+    @reported_task("faucet")
     async def process_request_tokens_from_faucet(self) -> OperationResult | None:
         max_attempts = config.attempts_and_delay_settings.max_faucet_attempts
 
@@ -153,28 +222,26 @@ class Bot:
 
             try:
                 db_account_value = await self._ensure_db_account()
+                note_attempt(db_account_value.active_account_proxy)
 
                 if config.web3_settings.verify_balance:
-                    wallet = Web3Wallet(
-                        private_key=db_account_value.private_key,
-                        rpc_url=config.web3_settings.irys_rpc_url,
-                        proxy=db_account_value.active_account_proxy
-                    )
+                    wallet = Web3Wallet(**self._web3_params(db_account_value))
                     balance = await wallet.human_balance()
                     if balance > 0:
-                        logger.success(f"Account: {db_account_value.wallet_address} | Balance is sufficient ({balance} IRYS) | Skipped faucet")
+                        logger.success("Account: {} | Balance is sufficient ({} IRYS) | Skipped faucet", db_account_value.wallet_address, balance)
                         return operation_success(self.account_data.private_key)
 
-                api = IrysAPI(proxy=db_account_value.active_account_proxy)
+                api = IrysAPI(proxy=db_account_value.active_account_proxy, proxy_manager=proxy_manager)
                 captcha_token = await self.get_captcha(wallet_address=db_account_value.wallet_address, captcha_type="cf")
 
-                logger.info(f"Account: {db_account_value.wallet_address} | Requesting tokens from faucet")
+                logger.info("Account: {} | Requesting tokens from faucet", db_account_value.wallet_address)
                 await api.call_faucet(captcha_token=captcha_token, wallet_address=db_account_value.wallet_address)
 
-                logger.success(f"Account: {db_account_value.wallet_address} | Tokens requested")
+                logger.success("Account: {} | Tokens requested", db_account_value.wallet_address)
                 return operation_success(self.account_data.private_key)
 
             except APIError as error:
+                self._note_error(error)
                 is_last_attempt = attempt == max_attempts - 1
                 if is_last_attempt:
                     logger.error(f"Account: {self.account_data.wallet_address} | Max attempts reached, unable to request tokens from faucet | Skipped permanently")
@@ -189,14 +256,20 @@ class Bot:
                 return operation_failed(self.account_data.private_key)
 
             except Exception as error:
+                self._note_error(error)
                 is_last_attempt = attempt == max_attempts - 1
                 if is_last_attempt:
                     logger.error(f"Account: {self.account_data.wallet_address} | Max attempts reached, unable to request tokens from faucet | Skipped permanently")
                     return operation_failed(self.account_data.private_key)
 
+                error_class = classify_error(error)
                 error = validate_error(error)
-                logger.error(f"Account: {self.account_data.wallet_address} | Error occurred during requesting tokens (Generic Exception): {error}")
-                await self._update_account_proxy(attempt, max_attempts)
+                if not error_class.retryable:
+                    logger.error(f"Account: {self.account_data.wallet_address} | Error occurred during requesting tokens ({error_class.name}): {error} | Skipped permanently")
+                    return operation_failed(self.account_data.private_key)
+
+                logger.error(f"Account: {self.account_data.wallet_address} | Error occurred during requesting tokens ({error_class.name}): {error}")
+                await self._update_account_proxy(attempt, max_attempts, error_class)
 
             finally:
                 if api:
@@ -206,6 +279,7 @@ class Bot:
                     await wallet.cleanup()
 
 
+    @reported_task("top_up_game_balance")
     async def process_top_up_game_balance(self):
         max_attempts = config.attempts_and_delay_settings.max_games_attempts
 
@@ -214,18 +288,15 @@ class Bot:
 
             try:
                 db_account_value = await self._ensure_db_account()
+                note_attempt(db_account_value.active_account_proxy)
 
-                logger.info(f"Account: {db_account_value.wallet_address} | Preparing to top up game balance..")
-                irys_games_module = IrysGamesModule(
-                    private_key=db_account_value.private_key,
-                    rpc_url=config.web3_settings.irys_rpc_url,
-                    proxy=db_account_value.active_account_proxy
-                )
+                logger.info("Account: {} | Preparing to top up game balance..", db_account_value.wallet_address)
+                irys_games_module = IrysGamesModule(**self._web3_params(db_account_value))
 
                 if config.web3_settings.verify_balance:
                     play_balance = await irys_games_module.get_play_balance()
                     if play_balance > 0:
-                        logger.success(f"Account: {db_account_value.wallet_address} | Play balance is sufficient ({play_balance} IRYS) | Skipped top-up")
+                        logger.success("Account: {} | Play balance is sufficient ({} IRYS) | Skipped top-up", db_account_value.wallet_address, play_balance)
                         return operation_success(self.account_data.private_key)
 
                 top_up_amount = round(
@@ -235,7 +306,7 @@ class Bot:
                     ),
                     5
                 )
-                logger.info(f"Account: {db_account_value.wallet_address} | Topping up game balance with {top_up_amount} IRYS..")
+                logger.info("Account: {} | Topping up game balance with {} IRYS..", db_account_value.wallet_address, top_up_amount)
 
                 irys_balance = await irys_games_module.human_balance()
                 if irys_balance < top_up_amount + 0.001:
@@ -244,31 +315,40 @@ class Bot:
 
                 success, result = await irys_games_module.deposit_tokens(amount=top_up_amount)
                 if success:
-                    logger.success(f"Account: {db_account_value.wallet_address} | Game balance topped up | TX: {self.tx_hash_to_explorer_link(result)}")
+                    note_tx_hash(result)
+                    logger.success("Account: {} | Game balance topped up | TX: {}", db_account_value.wallet_address, self.tx_hash_to_explorer_link(result))
                     return operation_success(self.account_data.private_key)
                 else:
                     logger.error(f"Account: {db_account_value.wallet_address} | Failed to top up game balance: {result} | Skipped permanently")
                     return operation_failed(self.account_data.private_key)
 
             except APIError as error:
+                self._note_error(error)
                 logger.error(f"Account: {self.account_data.wallet_address} | Error occurred during balance top up (APIError): {error} | Skipped permanently")
                 return operation_failed(self.account_data.private_key)
 
             except Exception as error:
+                self._note_error(error)
                 is_last_attempt = attempt == max_attempts - 1
                 if is_last_attempt:
                     logger.error(f"Account: {self.account_data.wallet_address} | Max attempts reached, unable to top up game balance | Skipped permanently")
                     return operation_failed(self.account_data.private_key)
 
+                error_class = classify_error(error)
                 error = validate_error(error)
-                logger.error(f"Account: {self.account_data.wallet_address} | Error occurred during balance top up (Generic Exception): {error}")
-                await self._update_account_proxy(attempt, max_attempts)
+                if not error_class.retryable:
+                    logger.error(f"Account: {self.account_data.wallet_address} | Error occurred during balance top up ({error_class.name}): {error} | Skipped permanently")
+                    return operation_failed(self.account_data.private_key)
+
+                logger.error(f"Account: {self.account_data.wallet_address} | Error occurred during balance top up ({error_class.name}): {error}")
+                await self._update_account_proxy(attempt, max_attempts, error_class)
 
             finally:
                 if irys_games_module:
                     await irys_games_module.cleanup()
 
 
+    @reported_task("mint_omnihub_nft")
     async def process_mint_omnihub_nft(self):
         max_attempts = config.attempts_and_delay_settings.max_faucet_attempts
 
@@ -277,47 +357,53 @@ class Bot:
 
             try:
                 db_account_value = await self._ensure_db_account()
+                note_attempt(db_account_value.active_account_proxy)
 
-                logger.info(f"Account: {db_account_value.wallet_address} | Preparing to mint Omnihub NFT..")
-                irys_omnihub_module = IrysOmnihubModule(
-                    private_key=db_account_value.private_key,
-                    rpc_url=config.web3_settings.irys_rpc_url,
-                    proxy=db_account_value.active_account_proxy
-                )
+                logger.info("Account: {} | Preparing to mint Omnihub NFT..", db_account_value.wallet_address)
+                irys_omnihub_module = IrysOmnihubModule(**self._web3_params(db_account_value))
 
                 balance = await irys_omnihub_module.human_balance()
                 if balance < 0.001:
                     logger.error(f"Account: {db_account_value.wallet_address} | Not enough IRYS balance to mint NFT | Available: {balance} IRYS | Required at least: 0.001 IRYS | Skipped permanently")
                     return operation_failed(self.account_data.private_key)
 
-                logger.info(f"Account: {db_account_value.wallet_address} | Minting Omnihub NFT..")
+                logger.info("Account: {} | Minting Omnihub NFT..", db_account_value.wallet_address)
                 success, result = await irys_omnihub_module.mint_nft()
                 if success:
-                    logger.success(f"Account: {db_account_value.wallet_address} | Omnihub NFT minted | TX: {self.tx_hash_to_explorer_link(result)}")
+                    note_tx_hash(result)
+                    logger.success("Account: {} | Omnihub NFT minted | TX: {}", db_account_value.wallet_address, self.tx_hash_to_explorer_link(result))
                     return operation_success(self.account_data.private_key)
                 else:
                     logger.error(f"Account: {db_account_value.wallet_address} | Failed to mint Omnihub NFT: {result} | Skipped permanently")
                     return operation_failed(self.account_data.private_key)
 
             except APIError as error:
+                self._note_error(error)
                 logger.error(f"Account: {self.account_data.wallet_address} | Error occurred during minting Omnihub NFT (APIError): {error} | Skipped permanently")
                 return operation_failed(self.account_data.private_key)
 
             except Exception as error:
+                self._note_error(error)
                 is_last_attempt = attempt == max_attempts - 1
                 if is_last_attempt:
                     logger.error(f"Account: {self.account_data.wallet_address} | Max attempts reached, unable to mint Omnihub NFT | Skipped permanently")
                     return operation_failed(self.account_data.private_key)
 
+                error_class = classify_error(error)
                 error = validate_error(error)
-                logger.error(f"Account: {self.account_data.wallet_address} | Error occurred during minting Omnihub NFT (Generic Exception): {error}")
-                await self._update_account_proxy(attempt, max_attempts)
+                if not error_class.retryable:
+                    logger.error(f"Account: {self.account_data.wallet_address} | Error occurred during minting Omnihub NFT ({error_class.name}): {error} | Skipped permanently")
+                    return operation_failed(self.account_data.private_key)
+
+                logger.error(f"Account: {self.account_data.wallet_address} | Error occurred during minting Omnihub NFT ({error_class.name}): {error}")
+                await self._update_account_proxy(attempt, max_attempts, error_class)
 
             finally:
                 if irys_omnihub_module:
                     await irys_omnihub_module.cleanup()
 
 
+    @reported_task("wait_for_balance")
     async def process_wait_for_balance(self):
         TIME_LIMIT = 60
         CHECK_INTERVAL = 10
@@ -325,19 +411,16 @@ class Bot:
 
         try:
             db_account_value = await self._ensure_db_account()
+            note_attempt(db_account_value.active_account_proxy)
 
-            logger.info(f"Account: {db_account_value.wallet_address} | Waiting for IRYS balance..")
-            wallet = Web3Wallet(
-                private_key=db_account_value.private_key,
-                rpc_url=config.web3_settings.irys_rpc_url,
-                proxy=db_account_value.active_account_proxy
-            )
+            logger.info("Account: {} | Waiting for IRYS balance..", db_account_value.wallet_address)
+            wallet = Web3Wallet(**self._web3_params(db_account_value))
 
             start = time.monotonic()
             while True:
                 balance = await wallet.human_balance()
                 if balance > 0:
-                    logger.success(f"Account: {db_account_value.wallet_address} | Balance sufficient ({balance} IRYS) | Continuing..")
+                    logger.success("Account: {} | Balance sufficient ({} IRYS) | Continuing..", db_account_value.wallet_address, balance)
                     return operation_success(self.account_data.private_key)
 
                 elapsed = time.monotonic() - start
@@ -347,10 +430,11 @@ class Bot:
 
                 remaining = int(TIME_LIMIT - elapsed)
                 sleep_for = min(CHECK_INTERVAL, remaining)
-                logger.info(f"Account: {db_account_value.wallet_address} | Balance insufficient ({balance} IRYS) | Checking again in {int(sleep_for)}s..")
-                await asyncio.sleep(sleep_for)
+                logger.info("Account: {} | Balance insufficient ({} IRYS) | Checking again in {}s..", db_account_value.wallet_address, balance, int(sleep_for))
+                await self._sleep(sleep_for)
 
         except Exception as error:
+            self._note_error(error)
             error = validate_error(error)
             logger.error(f"Account: {self.account_data.wallet_address} | Error occurred during waiting for balance (Generic Exception): {error} | Skipped permanently")
             return operation_failed(self.account_data.private_key)
@@ -359,14 +443,18 @@ class Bot:
             if wallet:
                 await wallet.cleanup()
 
+    @reported_task("all_in_one")
     async def process_all_in_one(self) -> OperationResult | None:
 
         try:
             db_account_value = await self._ensure_db_account()
+            note_attempt(db_account_value.active_account_proxy)
 
             for task in config.all_in_one_settings.tasks_to_perform:
                 if task == "faucet":
                     operation_result = await self.process_request_tokens_from_faucet()
+                    if captcha_pool is not None:
+                        captcha_pool.consumer_done(self.account_data.wallet_address)
                 elif task == "wait_for_balance":
                     operation_result = await self.process_wait_for_balance()
                 elif task == "top_up_game_balance":
@@ -383,7 +471,7 @@ class Bot:
                     logger.error(f"Account: {db_account_value.wallet_address} | Task {task} failed | Skipped permanently")
                     return operation_failed(self.account_data.private_key)
                 else:
-                    logger.success(f"Account: {db_account_value.wallet_address} | Task {task} completed")
+                    logger.success("Account: {} | Task {} completed", db_account_value.wallet_address, task)
 
                 is_last_task = task == config.all_in_one_settings.tasks_to_perform[-1]
                 if is_last_task:
@@ -393,17 +481,19 @@ class Bot:
                     config.attempts_and_delay_settings.delay_between_tasks.min,
                     config.attempts_and_delay_settings.delay_between_tasks.max
                 )
-                logger.info(f"Account: {db_account_value.wallet_address} | Waiting {delay}s before starting the next task..")
-                await asyncio.sleep(delay)
+                logger.info("Account: {} | Waiting {}s before starting the next task..", db_account_value.wallet_address, delay)
+                await self._sleep(delay)
 
-            logger.success(f"Account: {db_account_value.wallet_address} | All tasks completed")
+            logger.success("Account: {} | All tasks completed", db_account_value.wallet_address)
             return operation_success(self.account_data.private_key)
 
         except Exception as error:
+            self._note_error(error)
             error = validate_error(error)
             logger.error(f"Account: {self.account_data.wallet_address} | Error occurred during completing tasks (Generic Exception): {error} | Skipped permanently")
             return operation_failed(self.account_data.private_key)
 
+    @reported_task("play_games")
     async def process_play_games(self):
         max_attempts = config.attempts_and_delay_settings.max_games_attempts
         completed_games = []
@@ -413,26 +503,35 @@ class Bot:
 
             try:
                 db_account_value = await self._ensure_db_account()
+                note_attempt(db_account_value.active_account_proxy)
 
-                logger.info(f"Account: {db_account_value.wallet_address} | Preparing to play games..")
-                irys_games_module = IrysGamesModule(
-                    private_key=db_account_value.private_key,
-                    rpc_url=config.web3_settings.irys_rpc_url,
-                    proxy=db_account_value.active_account_proxy
-                )
-                api = IrysAPI(proxy=db_account_value.active_account_proxy)
+                logger.info("Account: {} | Preparing to play games..", db_account_value.wallet_address)
+                irys_games_module = IrysGamesModule(**self._web3_params(db_account_value))
+                api = IrysAPI(proxy=db_account_value.active_account_proxy, proxy_manager=proxy_manager)
 
                 play_balance = await irys_games_module.get_play_balance()
                 if play_balance > 0:
-                    logger.success(f"Account: {db_account_value.wallet_address} | Play balance is sufficient ({play_balance} IRYS)")
+                    logger.success("Account: {} | Play balance is sufficient ({} IRYS)", db_account_value.wallet_address, play_balance)
                 else:
-                    logger.info(f"Account: {db_account_value.wallet_address} | Play balance is insufficient ({play_balance} IRYS) | Please top up the game balance first | Skipped permanently")
+                    logger.info("Account: {} | Play balance is insufficient ({} IRYS) | Please top up the game balance first | Skipped permanently", db_account_value.wallet_address, play_balance)
                     return operation_failed(self.account_data.private_key)
 
                 random.shuffle(config.games_settings.games_to_play)
+                if config.games_settings.overlap_sessions:
+                    games = [game for game in config.games_settings.games_to_play if game not in completed_games]
+                    if "spritetype" in games:
+                        # Sprite Type submits its result in one request, there is no session to overlap
+                        await self.execute_sprite_type_game(api=api, db_account_value=db_account_value)
+                        completed_games.append("spritetype")
+                        games.remove("spritetype")
+
+                    await self.execute_games_overlapped(games, api, irys_games_module, db_account_value, completed_games)
+                    logger.success("Account: {} | All games completed", db_account_value.wallet_address)
+                    return operation_success(self.account_data.private_key)
+
                 for game in config.games_settings.games_to_play:
                     if game in completed_games:
-                        logger.info(f"Account: {db_account_value.wallet_address} | Game {game} already completed | Skipped")
+                        logger.info("Account: {} | Game {} already completed | Skipped", db_account_value.wallet_address, game)
                         continue
 
                     if game == "spritetype":
@@ -451,25 +550,32 @@ class Bot:
                         config.attempts_and_delay_settings.delay_for_game.min,
                         config.attempts_and_delay_settings.delay_for_game.max
                     )
-                    logger.info(f"Account: {db_account_value.wallet_address} | Waiting {delay}s before starting the next game..")
-                    await asyncio.sleep(delay)
+                    logger.info("Account: {} | Waiting {}s before starting the next game..", db_account_value.wallet_address, delay)
+                    await self._sleep(delay)
 
-                logger.success(f"Account: {db_account_value.wallet_address} | All games completed")
+                logger.success("Account: {} | All games completed", db_account_value.wallet_address)
                 return operation_success(self.account_data.private_key)
 
             except APIError as error:
+                self._note_error(error)
                 logger.error(f"Account: {self.account_data.wallet_address} | Error occurred during playing games (APIError): {error} | Skipped permanently")
                 return operation_failed(self.account_data.private_key)
 
             except Exception as error:
+                self._note_error(error)
                 is_last_attempt = attempt == max_attempts - 1
                 if is_last_attempt:
                     logger.error(f"Account: {self.account_data.wallet_address} | Max attempts reached, unable to play games | Skipped permanently")
                     return operation_failed(self.account_data.private_key)
 
+                error_class = classify_error(error)
                 error = validate_error(error)
-                logger.error(f"Account: {self.account_data.wallet_address} | Error occurred during playing games (Generic Exception): {error}")
-                await self._update_account_proxy(attempt, max_attempts)
+                if not error_class.retryable:
+                    logger.error(f"Account: {self.account_data.wallet_address} | Error occurred during playing games ({error_class.name}): {error} | Skipped permanently")
+                    return operation_failed(self.account_data.private_key)
+
+                logger.error(f"Account: {self.account_data.wallet_address} | Error occurred during playing games ({error_class.name}): {error}")
+                await self._update_account_proxy(attempt, max_attempts, error_class)
 
             finally:
                 if irys_games_module:
@@ -477,9 +583,89 @@ class Bot:
 
 
     async def execute_game(self, game: GameType, api: IrysAPI, irys_games_module: IrysGamesModule, db_account_value: Accounts) -> None:
-        logger.info(f"Account: {db_account_value.wallet_address} | Starting game: {game}")
+        session_id, initial_ts = await self.start_game_session(game, api, irys_games_module, db_account_value)
+        delay = random.randint(
+            config.attempts_and_delay_settings.delay_for_game.min,
+            config.attempts_and_delay_settings.delay_for_game.max
+        )
+
+        logger.info("Account: {} | Waiting {}s before finishing game {}..", db_account_value.wallet_address, delay, game)
+        await self._sleep(delay)
+        await self.complete_game_session(game, session_id, initial_ts, api, irys_games_module, db_account_value)
+
+    async def execute_games_overlapped(
+            self,
+            games: list[GameType],
+            api: IrysAPI,
+            irys_games_module: IrysGamesModule,
+            db_account_value: Accounts,
+            completed_games: list[str]
+    ) -> None:
+        # Starts up to max_open_sessions games, waits one play window for all of them and completes them together.
+        # Sessions that were started are completed even if a later start fails, the error is raised afterwards
+        max_open_sessions = config.games_settings.max_open_sessions
+
+        for batch_start in range(0, len(games), max_open_sessions):
+            if batch_start:
+                delay = random.randint(
+                    config.attempts_and_delay_settings.delay_for_game.min,
+                    config.attempts_and_delay_settings.delay_for_game.max
+                )
+                logger.info("Account: {} | Waiting {}s before starting the next games..", db_account_value.wallet_address, delay)
+                await self._sleep(delay)
+
+            sessions: list[tuple[GameType, str, int]] = []
+            start_error = None
+            for game in games[batch_start:batch_start + max_open_sessions]:
+                try:
+                    # Starts stay sequential so each payment authorization gets its own timestamp
+                    session_id, initial_ts = await self.start_game_session(
+                        game, api, irys_games_module, db_account_value, {session[1] for session in sessions}
+                    )
+                except Exception as error:
+                    start_error = error
+                    break
+                sessions.append((game, session_id, initial_ts))
+
+            if sessions:
+                delay = random.randint(
+                    config.attempts_and_delay_settings.delay_for_game.min,
+                    config.attempts_and_delay_settings.delay_for_game.max
+                )
+                logger.info("Account: {} | {} games open | Waiting {}s before finishing them..", db_account_value.wallet_address, len(sessions), delay)
+                await self._sleep(delay)
+
+            results = await asyncio.gather(
+                *(
+                    self.complete_game_session(game, session_id, initial_ts, api, irys_games_module, db_account_value)
+                    for game, session_id, initial_ts in sessions
+                ),
+                return_exceptions=True
+            )
+
+            errors = [start_error] if start_error else []
+            for (game, _, _), result in zip(sessions, results):
+                if isinstance(result, BaseException):
+                    errors.append(result)
+                else:
+                    completed_games.append(game)
+
+            if errors:
+                raise errors[0]
+
+    async def start_game_session(
+            self,
+            game: GameType,
+            api: IrysAPI,
+            irys_games_module: IrysGamesModule,
+            db_account_value: Accounts,
+            open_sessions: set[str] = frozenset()
+    ) -> tuple[str, int]:
+        logger.info("Account: {} | Starting game: {}", db_account_value.wallet_address, game)
         message, signature, initial_ts = await irys_games_module.authorize_payment()
         session_id = generate_session_id(initial_ts)
+        while session_id in open_sessions:
+            session_id = generate_session_id(initial_ts)
 
         response = await api.start_game(
             player_address=db_account_value.wallet_address,
@@ -490,15 +676,20 @@ class Bot:
             game_type=game
         )
 
+        note_tx_hash(response["transactionHash"])
         tx = self.tx_hash_to_explorer_link(response["transactionHash"])
-        delay = random.randint(
-            config.attempts_and_delay_settings.delay_for_game.min,
-            config.attempts_and_delay_settings.delay_for_game.max
-        )
-
-        logger.info(f"Account: {db_account_value.wallet_address} | Game {game} started | TX: {tx} | Waiting {delay}s before finishing..")
-        await asyncio.sleep(delay)
-
+        logger.info("Account: {} | Game {} started | Session: {} | TX: {}", db_account_value.wallet_address, game, session_id, tx)
+        return session_id, initial_ts
+
+    async def complete_game_session(
+            self,
+            game: GameType,
+            session_id: str,
+            initial_ts: int,
+            api: IrysAPI,
+            irys_games_module: IrysGamesModule,
+            db_account_value: Accounts
+    ) -> None:
         if game == "snake":
             score = random.randint(1000, 1500)
         elif game == "missile":
@@ -525,19 +716,20 @@ class Bot:
             score=score
         )
 
+        note_tx_hash(response["transactionHash"])
         tx = self.tx_hash_to_explorer_link(response["transactionHash"])
-        logger.success(f"Account: {db_account_value.wallet_address} | Game {game} completed | Score: {score} | TX: {tx}")
+        logger.success("Account: {} | Game {} completed | Score: {} | TX: {}", db_account_value.wallet_address, game, score, tx)
 
 
     @staticmethod
     async def execute_sprite_type_game(api: IrysAPI, db_account_value: Accounts):
-        logger.info(f"Account: {db_account_value.wallet_address} | Starting game: Sprite Type")
+        logger.info("Account: {} | Starting game: Sprite Type", db_account_value.wallet_address)
         game_stats = generate_sprite_game_stats()
 
         anti_cheat_hash = generate_anti_cheat_hash(db_account_value.wallet_address, game_stats)
-        logger.info(f"Account: {db_account_value.wallet_address} | Generated game stats and anti-cheat hash")
+        logger.info("Account: {} | Generated game stats and anti-cheat hash", db_account_value.wallet_address)
 
-        logger.info(f"Account: {db_account_value.wallet_address} | Submitting game results to the server..")
+        logger.info("Account: {} | Submitting game results to the server..", db_account_value.wallet_address)
         ts = int(time.time() * 1000)
         response = await api.submit_result_for_sprite_type(
             wallet_address=db_account_value.wallet_address,
@@ -547,4 +739,4 @@ class Bot:
         )
 
         url = response["url"]
-        logger.success(f"Account: {db_account_value.wallet_address} | Sprite Type game completed | View results at: {url}")
+        logger.success("Account: {} | Sprite Type game completed | View results at: {}", db_account_value.wallet_address, url)
@@ -1,2 +1,5 @@
 from .base import TwoCaptchaSolver, CapmonsterSolver, CapsolverSolver, AntiCaptchaSolver
 from .solvium import SolviumCaptchaSolver
+from .prefetch import CaptchaTokenPool
+from .poller import ResultPoller
+from .router import CaptchaRouter
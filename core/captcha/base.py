@@ -1,9 +1,13 @@
-import asyncio
 from typing import Optional
 import httpx
 
+from utils.monitoring.metrics import observe_captcha
+from .poller import ResultPoller
+
 
 class CaptchaSolverBase:
+    MAX_POLLS_PER_SECOND = 10
+
     def __init__(
             self,
             api_key: str,
@@ -17,7 +21,13 @@ class CaptchaSolverBase:
 
         self.base_url = base_url.rstrip("/")
         self.client = httpx.AsyncClient(timeout=10)
+        self.poller = ResultPoller(
+            self._fetch_result,
+            timeout=max_attempts * 3,
+            max_polls_per_second=self.MAX_POLLS_PER_SECOND,
+        )
 
+    @observe_captcha("turnstile")
     async def solve_turnistale(self, site_key: str, page_url: str) -> tuple[bool, Optional[str]] | tuple[bool, str]:
         captcha_type = "TurnstileTaskProxyless" if not self.base_url == "https://api.capsolver.com" else "AntiTurnstileTaskProxyLess"
 
@@ -51,6 +61,7 @@ class CaptchaSolverBase:
             return False, f"Unexpected error: {err}"
 
 
+    @observe_captcha("geetest")
     async def solve_geetest(self, page_url: str, gt: str, challenge: str, init_params: dict, version: int = 4) -> tuple[bool, Optional[str]] | tuple[bool, str]:
         captcha_type = "TurnstileTaskProxyless" if not self.base_url == "https://api.capsolver.com" else "AntiTurnstileTaskProxyLess"
 
@@ -87,27 +98,22 @@ class CaptchaSolverBase:
             return False, f"Unexpected error: {err}"
 
     async def get_captcha_result(self, task_id: int | str) -> tuple[bool, Optional[str]] | tuple[bool, str]:
-        for _ in range(self.max_attempts):
-            try:
-                resp = await self.client.post(f"{self.base_url}/getTaskResult", json={"clientKey": self.api_key, "taskId": task_id})
-                resp.raise_for_status()
-                result = resp.json()
-
-                if result.get("errorId") != 0:
-                    return False, result.get("errorDescription", "Unknown error")
+        return await self.poller.wait(task_id)
 
-                if result.get("status") == "ready":
-                    solution = result["solution"].get("token") or result["solution"].get("text") or result["solution"].get("gRecaptchaResponse")
-                    return True, solution
+    async def _fetch_result(self, task_id: int | str) -> Optional[tuple[bool, str]]:
+        # One status request, None while the task is still processing
+        resp = await self.client.post(f"{self.base_url}/getTaskResult", json={"clientKey": self.api_key, "taskId": task_id})
+        resp.raise_for_status()
+        result = resp.json()
 
-                await asyncio.sleep(3)
+        if result.get("errorId") != 0:
+            return False, result.get("errorDescription", "Unknown error")
 
-            except httpx.HTTPStatusError as err:
-                return False, f"HTTP error: {err}"
-            except Exception as err:
-                return False, f"Unexpected error: {err}"
+        if result.get("status") == "ready":
+            solution = result["solution"].get("token") or result["solution"].get("text") or result["solution"].get("gRecaptchaResponse")
+            return True, solution
 
-        return False, "Max time for solving exhausted"
+        return None
 
 
 class AntiCaptchaSolver(CaptchaSolverBase):
@@ -0,0 +1,174 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+
+PollResult = tuple[bool, str]
+TaskId = int | str
+
+
+class ResultPoller:
+    # One polling loop per provider for every outstanding task. The first poll of a task waits
+    # for the 10th percentile of recent solve times, later polls follow the spread between
+    # the 10th and 90th percentile. Polls share one rate limit and back off on HTTP 429
+    def __init__(
+        self,
+        fetch: Callable[[TaskId], Awaitable[Optional[PollResult]]],
+        timeout: float = 30.0,
+        default_interval: float = 3.0,
+        min_interval: float = 1.0,
+        max_interval: float = 5.0,
+        max_polls_per_second: float = 10.0,
+        samples: int = 200,
+    ):
+        self.fetch = fetch
+        self.timeout = timeout
+        self.default_interval = default_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_polls_per_second = max_polls_per_second
+
+        # task id -> (future, submitted at, last poll that found it unfinished)
+        self._pending: dict[TaskId, tuple[asyncio.Future, float, float]] = {}
+        self._schedule: list[tuple[float, int, TaskId]] = []
+        self._sequence = itertools.count()
+        self._polling: set[asyncio.Task] = set()
+        self._durations: deque[float] = deque(maxlen=samples)
+        self._sorted_durations: Optional[list[float]] = None
+
+        self._budget = max_polls_per_second
+        self._budget_updated = time.monotonic()
+        self._paused_until = 0.0
+        self._backoff = 1.0
+
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def wait(self, task_id: TaskId) -> PollResult:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+
+        future = asyncio.get_running_loop().create_future()
+        now = time.monotonic()
+        self._pending[task_id] = (future, now, now)
+        self._push(now + self._first_delay(), task_id)
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+        try:
+            return await future
+        finally:
+            # A cancelled caller leaves no task behind, the loop stops once nothing is pending
+            self._pending.pop(task_id, None)
+            self._wakeup.set()
+
+    def _percentile(self, q: float) -> float:
+        if self._sorted_durations is None:
+            self._sorted_durations = sorted(self._durations)
+        values = self._sorted_durations
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+    def _first_delay(self) -> float:
+        if len(self._durations) < 10:
+            return 0.0
+        return self._percentile(0.1)
+
+    def _interval(self) -> float:
+        if len(self._durations) < 10:
+            return self.default_interval
+
+        spread = self._percentile(0.9) - self._percentile(0.1)
+        return min(max(spread / 8, self.min_interval), self.max_interval)
+
+    def _push(self, due: float, task_id: TaskId) -> None:
+        heapq.heappush(self._schedule, (due, next(self._sequence), task_id))
+        self._wakeup.set()
+
+    def _next_allowed(self, now: float) -> float:
+        self._budget = min(
+            self.max_polls_per_second,
+            self._budget + (now - self._budget_updated) * self.max_polls_per_second,
+        )
+        self._budget_updated = now
+
+        ready_at = now if self._budget >= 1 else now + (1 - self._budget) / self.max_polls_per_second
+        return max(ready_at, self._paused_until)
+
+    async def _run(self) -> None:
+        try:
+            while self._pending:
+                now = time.monotonic()
+                if not self._schedule:
+                    # Only polls in flight, they reschedule or resolve their task
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                due, _, task_id = self._schedule[0]
+                start_at = max(due, self._next_allowed(now))
+                if start_at > now:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=start_at - now)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                heapq.heappop(self._schedule)
+                if task_id not in self._pending:
+                    continue
+
+                self._budget -= 1
+                poll = asyncio.create_task(self._poll(task_id))
+                self._polling.add(poll)
+                poll.add_done_callback(self._polling.discard)
+        finally:
+            self._task = None
+
+    async def _poll(self, task_id: TaskId) -> None:
+        try:
+            result = await self.fetch(task_id)
+        except httpx.HTTPStatusError as err:
+            if err.response.status_code != 429:
+                result = (False, f"HTTP error: {err}")
+            else:
+                # Rate limited, the whole provider pauses and this task counts as not ready yet
+                self._paused_until = time.monotonic() + self._backoff
+                self._backoff = min(self._backoff * 2, 30.0)
+                result = None
+        except Exception as err:
+            result = (False, f"Unexpected error: {err}")
+        else:
+            self._backoff = 1.0
+
+        entry = self._pending.get(task_id)
+        if entry is None:
+            return
+
+        future, submitted_at, last_miss = entry
+        now = time.monotonic()
+
+        if result is None:
+            if now - submitted_at < self.timeout:
+                self._pending[task_id] = (future, submitted_at, now)
+                self._push(max(now + self._interval(), self._paused_until), task_id)
+                return
+            result = (False, "Max time for solving exhausted")
+
+        elif result[0]:
+            # The task finished somewhere between the last miss and this poll, taking the middle
+            # keeps the polling delay itself from inflating the samples
+            self._durations.append((last_miss + now) / 2 - submitted_at)
+            self._sorted_durations = None
+
+        del self._pending[task_id]
+        if not future.done():
+            future.set_result(result)
+        self._wakeup.set()
@@ -0,0 +1,190 @@
+import asyncio
+import math
+import time
+
+from collections import deque
+from typing import Optional
+
+from loguru import logger
+
+from .base import CaptchaSolverBase
+from .router import CaptchaRouter
+from .solvium import SolviumCaptchaSolver
+
+
+class CaptchaTokenPool:
+    # Solves Turnstile tokens for one site key in the background so accounts take a ready one.
+    # The number of solves in flight follows Little's law: tokens consumed per second times the
+    # average solve time, plus up to `pool_size` kept ready for bursts. The pool stops on its own
+    # once every expected consumer has passed its faucet step, unused tokens are paid solves
+    def __init__(
+        self,
+        solver: CaptchaSolverBase | SolviumCaptchaSolver | CaptchaRouter,
+        site_key: str,
+        page_url: str,
+        pool_size: int = 3,
+        max_in_flight: int = 10,
+        token_ttl: float = 100.0,
+        demand_window: float = 60.0,
+    ):
+        self.solver = solver
+        self.site_key = site_key
+        self.page_url = page_url
+        self.pool_size = pool_size
+        self.max_in_flight = max_in_flight
+        self.token_ttl = token_ttl
+        self.demand_window = demand_window
+
+        self._tokens: deque[tuple[str, float]] = deque()
+        self._waiters: deque[asyncio.Future] = deque()
+        self._solving: set[asyncio.Task] = set()
+        # Tasks cancelled by a shutdown, awaited in stop() so none outlives the run
+        self._cancelled: list[asyncio.Task] = []
+        self._consumed: deque[float] = deque()
+        self._solve_time = 20.0
+        self._failures = 0
+        self._paused_until = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._started_at = 0.0
+        self._consumers: Optional[int] = None
+        self._finished_consumers: set[str] = set()
+        self.stats = {"solved": 0, "failed": 0, "taken_ready": 0, "waited": 0, "expired": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self, consumers: int = None) -> None:
+        if self._task is None:
+            # Every run measures its own demand and failures, the previous module's do not apply
+            self._started_at = time.monotonic()
+            self._consumers = consumers
+            self._finished_consumers = set()
+            self._consumed.clear()
+            self._failures = 0
+            self._paused_until = 0.0
+            self.stats = {"solved": 0, "failed": 0, "taken_ready": 0, "waited": 0, "expired": 0}
+            self._task = asyncio.create_task(self._run())
+
+    def consumer_done(self, consumer: str) -> None:
+        # Called when an account is past its faucet step, repeated calls for one account count once
+        if self._task is None or self._consumers is None:
+            return
+
+        self._finished_consumers.add(consumer)
+        if len(self._finished_consumers) >= self._consumers:
+            logger.debug("Every account is past the faucet, stopping captcha prefetch")
+            self._shutdown()
+
+    async def stop(self) -> None:
+        # The pool may already have shut itself down in consumer_done, its tasks are still awaited here
+        if self._task is not None:
+            self._shutdown()
+
+        cancelled, self._cancelled = self._cancelled, []
+        await asyncio.gather(*cancelled, return_exceptions=True)
+
+    def _shutdown(self) -> None:
+        for task in [self._task, *self._solving]:
+            task.cancel()
+            self._cancelled.append(task)
+
+        self._task = None
+        self._solving.clear()
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+        self.stats["expired"] += len(self._tokens)
+        self._tokens.clear()
+        logger.info(f"Captcha prefetch pool stopped | {self.stats}")
+
+    async def get(self, timeout: float) -> Optional[str]:
+        # Returns None when no token arrived in time, the caller then solves one itself
+        now = time.monotonic()
+        self._consumed.append(now)
+        self._drop_expired(now)
+
+        if self._tokens:
+            self.stats["taken_ready"] += 1
+            token, _ = self._tokens.popleft()
+            self._fill()
+            return token
+
+        self.stats["waited"] += 1
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._fill()
+
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def _demand(self, now: float) -> float:
+        while self._consumed and now - self._consumed[0] > self.demand_window:
+            self._consumed.popleft()
+        # Right after the start the window is not full yet, the rate is taken over the elapsed time
+        elapsed = min(self.demand_window, max(now - self._started_at, 1.0))
+        return len(self._consumed) / elapsed
+
+    def _drop_expired(self, now: float) -> None:
+        while self._tokens and self._tokens[0][1] <= now:
+            self._tokens.popleft()
+            self.stats["expired"] += 1
+
+    def _fill(self) -> None:
+        now = time.monotonic()
+        if now < self._paused_until:
+            return
+
+        demand = self._demand(now)
+        waiting = sum(1 for waiter in self._waiters if not waiter.done())
+        # The spare tokens never exceed what was consumed in the last window, so without faucet calls
+        # the floor drops to 0. The first window uses the full pool, the module is about to need tokens
+        if now - self._started_at < self.demand_window:
+            spare = self.pool_size
+        else:
+            spare = min(self.pool_size, len(self._consumed))
+        target = spare + math.ceil(demand * self._solve_time) + waiting
+        needed = target - len(self._tokens) - len(self._solving)
+
+        for _ in range(min(needed, self.max_in_flight - len(self._solving))):
+            task = asyncio.create_task(self._solve())
+            self._solving.add(task)
+            task.add_done_callback(self._solving.discard)
+
+    async def _solve(self) -> None:
+        started = time.monotonic()
+        try:
+            success, result = await self.solver.solve_turnistale(site_key=self.site_key, page_url=self.page_url)
+        except Exception as error:
+            success, result = False, str(error)
+
+        if not success:
+            # A solver without balance or a wrong key fails instantly, back off instead of spinning
+            self.stats["failed"] += 1
+            self._failures += 1
+            self._paused_until = time.monotonic() + min(2 ** self._failures, 60)
+            logger.debug(f"Captcha prefetch failed: {result}")
+            return
+
+        finished = time.monotonic()
+        self.stats["solved"] += 1
+        self._failures = 0
+        self._solve_time = 0.8 * self._solve_time + 0.2 * (finished - started)
+
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(result)
+                return
+
+        self._tokens.append((result, finished + self.token_ttl))
+
+    async def _run(self) -> None:
+        while True:
+            self._drop_expired(time.monotonic())
+            self._fill()
+            await asyncio.sleep(1)
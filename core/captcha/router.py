@@ -0,0 +1,169 @@
+import asyncio
+import time
+
+from collections import deque
+from typing import Any, Optional
+
+from loguru import logger
+
+from .base import CaptchaSolverBase
+from .solvium import SolviumCaptchaSolver
+
+
+class ProviderStats:
+    def __init__(
+        self,
+        name: str,
+        solver: CaptchaSolverBase | SolviumCaptchaSolver,
+        alpha: float,
+        prior_latency: float,
+        explore_tries: int,
+    ):
+        self.name = name
+        self.solver = solver
+        self.alpha = alpha
+        self.prior_latency = prior_latency
+        self.explore_tries = explore_tries
+
+        self.latency: Optional[float] = None
+        self.success_rate = 1.0
+        self.tries = 0
+        self.solved = 0
+        self.samples: deque[float] = deque(maxlen=200)
+
+    @property
+    def score(self) -> float:
+        # Expected time until a solved captcha, every failure costs one more solve on average.
+        # Unmeasured providers start from a prior, one that never solved anything in
+        # `explore_tries` tries goes behind every provider that did
+        if self.tries >= self.explore_tries and self.solved == 0:
+            return self.prior_latency / 0.05 + self.tries
+
+        latency = self.latency if self.latency is not None else self.prior_latency
+        return latency / max(self.success_rate, 0.05)
+
+    def observe(self, latency: float, success: bool) -> None:
+        self.tries += 1
+        self.success_rate = self.alpha * (1.0 if success else 0.0) + (1 - self.alpha) * self.success_rate
+
+        if success:
+            self.solved += 1
+            self.samples.append(latency)
+            self.latency = latency if self.latency is None else self.alpha * latency + (1 - self.alpha) * self.latency
+        else:
+            # A failed solve still cost its time, it can only raise the estimate
+            self._raise_latency(latency)
+
+    def observe_cancelled(self, latency: float) -> None:
+        # A solve that lost a hedge took at least this long, but says nothing about the success rate
+        self.tries += 1
+        self._raise_latency(latency)
+
+    def _raise_latency(self, latency: float) -> None:
+        current = self.latency if self.latency is not None else self.prior_latency
+        if latency > current:
+            self.latency = self.alpha * latency + (1 - self.alpha) * current
+
+    def percentile(self, q: float) -> Optional[float]:
+        if len(self.samples) < 10:
+            return None
+
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class CaptchaRouter:
+    # Sends each captcha to the provider with the lowest expected solve time. With hedging on,
+    # a second provider gets the same captcha once the first is slower than its p90 or has failed,
+    # the first token wins and the other solve is cancelled
+    def __init__(
+        self,
+        solvers: dict[str, CaptchaSolverBase | SolviumCaptchaSolver],
+        hedge: bool = True,
+        alpha: float = 0.2,
+        default_hedge_delay: float = 20.0,
+        explore_tries: int = 3,
+    ):
+        if not solvers:
+            raise ValueError("At least one captcha solver is required")
+
+        # Until a provider is measured its latency is assumed to be the hedge delay
+        self.providers = [
+            ProviderStats(name, solver, alpha, prior_latency=default_hedge_delay, explore_tries=explore_tries)
+            for name, solver in solvers.items()
+        ]
+        self.hedge = hedge
+        self.default_hedge_delay = default_hedge_delay
+
+    def ranked(self, method: str) -> list[ProviderStats]:
+        # Solvium only solves Turnstile, providers without the method are skipped
+        return sorted(
+            (provider for provider in self.providers if hasattr(provider.solver, method)),
+            key=lambda provider: provider.score,
+        )
+
+    def hedge_delay(self, provider: ProviderStats) -> float:
+        p90 = provider.percentile(0.9)
+        return p90 if p90 is not None else self.default_hedge_delay
+
+    async def solve_turnistale(self, site_key: str, page_url: str) -> tuple[bool, Any] | tuple[bool, str]:
+        return await self._route("solve_turnistale", site_key=site_key, page_url=page_url)
+
+    async def solve_geetest(self, page_url: str, gt: str, challenge: str, init_params: dict, version: int = 4) -> tuple[bool, Any] | tuple[bool, str]:
+        return await self._route(
+            "solve_geetest", page_url=page_url, gt=gt, challenge=challenge, init_params=init_params, version=version
+        )
+
+    async def _solve(self, provider: ProviderStats, method: str, **kwargs: Any) -> tuple[bool, Any]:
+        started = time.monotonic()
+        try:
+            success, result = await getattr(provider.solver, method)(**kwargs)
+        except asyncio.CancelledError:
+            provider.observe_cancelled(time.monotonic() - started)
+            raise
+        except Exception as error:
+            success, result = False, f"Unexpected error: {error}"
+
+        provider.observe(time.monotonic() - started, success)
+        if not success:
+            logger.debug(f"Captcha provider {provider.name} failed: {result}")
+        return success, result
+
+    async def _route(self, method: str, **kwargs: Any) -> tuple[bool, Any] | tuple[bool, str]:
+        providers = self.ranked(method)
+        if not providers:
+            return False, f"No configured captcha provider supports {method}"
+
+        if len(providers) == 1 or not self.hedge:
+            success, result = await self._solve(providers[0], method, **kwargs)
+            if success or len(providers) == 1:
+                return success, result
+            return await self._solve(providers[1], method, **kwargs)
+
+        return await self._hedged(providers[0], providers[1], method, **kwargs)
+
+    async def _hedged(self, primary: ProviderStats, secondary: ProviderStats, method: str, **kwargs: Any) -> tuple[bool, Any]:
+        first = asyncio.create_task(self._solve(primary, method, **kwargs))
+        pending = {first}
+        try:
+            await asyncio.wait(pending, timeout=self.hedge_delay(primary))
+            if first.done() and first.result()[0]:
+                return first.result()
+
+            # Hedge fires either because the primary is slower than its p90 or because it already failed
+            logger.debug(f"Captcha provider {primary.name} is slow or failed, hedging with {secondary.name}")
+            pending = {task for task in pending if not task.done()}
+            pending.add(asyncio.create_task(self._solve(secondary, method, **kwargs)))
+
+            result = first.result() if first.done() else None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if result[0]:
+                        return result
+
+            return result
+        finally:
+            for task in pending:
+                task.cancel()
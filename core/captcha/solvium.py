@@ -1,12 +1,16 @@
-import asyncio
 import httpx
 
-from typing import Any
+from typing import Any, Optional
 
 from loguru import logger
 
+from utils.monitoring.metrics import observe_captcha
+from .poller import ResultPoller
+
 
 class SolviumCaptchaSolver:
+    MAX_POLLS_PER_SECOND = 10
+
     def __init__(
         self,
         api_key: str,
@@ -20,6 +24,11 @@ class SolviumCaptchaSolver:
             headers={"Authorization": f"Bearer {self.api_key}"},
             timeout=30,
         )
+        self.poller = ResultPoller(
+            self._fetch_result,
+            timeout=max_attempts * 3,
+            max_polls_per_second=self.MAX_POLLS_PER_SECOND,
+        )
 
     async def create_turnistale_task(self, site_key: str, page_url: str) -> tuple[bool, Any] | tuple[bool, str]:
         url = f"{self.base_url}/task/turnstile"
@@ -42,36 +51,28 @@ class SolviumCaptchaSolver:
             return False, f"Unexpected error while creating task: {e}"
 
     async def get_task_result(self, task_id: str) -> tuple[bool, Any] | tuple[bool, str]:
-        for attempt in range(self.max_attempts):
-            try:
-                response = await self.client.get(f"{self.base_url}/task/status/{task_id}")
-                response.raise_for_status()
-                result = response.json()
-
-                if (
-                    result.get("status") == "completed"
-                    and result.get("result")
-                    and result["result"].get("solution")
-                ):
-                    solution = result["result"]["solution"]
-                    return True, solution
-
-                elif result.get("status") in ["running", "pending"]:
-                    await asyncio.sleep(3)
-                    continue
+        return await self.poller.wait(task_id)
 
-                else:
-                    error = result["result"]["error"]
-                    return False, f"Error while getting captcha result: {error}"
+    async def _fetch_result(self, task_id: str) -> Optional[tuple[bool, Any]]:
+        # One status request, None while the task is still processing
+        response = await self.client.get(f"{self.base_url}/task/status/{task_id}")
+        response.raise_for_status()
+        result = response.json()
 
-            except httpx.HTTPStatusError as err:
-                return False, f"HTTP error occurred while solving captcha: {err}"
+        if (
+            result.get("status") == "completed"
+            and result.get("result")
+            and result["result"].get("solution")
+        ):
+            return True, result["result"]["solution"]
 
-            except Exception as e:
-                return False, f"Unexpected error occurred while solving captcha: {e}"
+        if result.get("status") in ["running", "pending"]:
+            return None
 
-        return False, "Max attempts exhausted"
+        error = result["result"]["error"]
+        return False, f"Error while getting captcha result: {error}"
 
+    @observe_captcha("turnstile")
     async def solve_turnistale(
         self, site_key: str, page_url: str
     ) -> tuple[Any, Any] | tuple[bool, Any] | tuple[bool, str]:
@@ -0,0 +1,106 @@
+import asyncio
+import re
+
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Optional
+
+from aiohttp import ClientHttpProxyError, ClientProxyConnectionError
+from web3.exceptions import ContractLogicError, TimeExhausted
+
+from .base import (
+    APIError, APIErrorType, CaptchaSolvingFailed,
+    NoAvailableProxies, ProxyForbidden, RateLimitExceeded, ServerError
+)
+
+
+class ErrorCause(str, Enum):
+    PROXY = "proxy"
+    SERVER = "server"
+    RATE_LIMIT = "rate_limit"
+    CHAIN = "chain"
+    CAPTCHA = "captcha"
+    # The API answered and refused the request (already claimed, invalid signature), not a load problem
+    API = "api"
+    UNKNOWN = "unknown"
+
+
+@dataclass(frozen=True, slots=True)
+class ErrorClass:
+    name: str
+    cause: ErrorCause
+    retryable: bool
+    rotate_proxy: bool
+    # Seconds to wait before the next attempt, None means attempts_and_delay_settings.error_delay
+    backoff: Optional[float] = None
+
+
+PROXY_FAILED = ErrorClass("proxy_failed", ErrorCause.PROXY, retryable=True, rotate_proxy=True)
+PROXY_FORBIDDEN = ErrorClass("proxy_forbidden", ErrorCause.PROXY, retryable=True, rotate_proxy=True, backoff=1)
+NO_PROXIES = ErrorClass("no_proxies", ErrorCause.PROXY, retryable=False, rotate_proxy=False)
+SERVER_ERROR = ErrorClass("server_error", ErrorCause.SERVER, retryable=True, rotate_proxy=False, backoff=5)
+EMPTY_RESPONSE = ErrorClass("empty_response", ErrorCause.SERVER, retryable=True, rotate_proxy=False, backoff=5)
+RATE_LIMITED = ErrorClass("rate_limited", ErrorCause.RATE_LIMIT, retryable=True, rotate_proxy=True, backoff=10)
+INVALID_CAPTCHA = ErrorClass("invalid_captcha", ErrorCause.CAPTCHA, retryable=True, rotate_proxy=True, backoff=1)
+CAPTCHA_FAILED = ErrorClass("captcha_failed", ErrorCause.CAPTCHA, retryable=True, rotate_proxy=False, backoff=1)
+NONCE_CONFLICT = ErrorClass("nonce_conflict", ErrorCause.CHAIN, retryable=True, rotate_proxy=False, backoff=3)
+TX_NOT_CONFIRMED = ErrorClass("tx_not_confirmed", ErrorCause.CHAIN, retryable=True, rotate_proxy=False, backoff=5)
+TX_REVERTED = ErrorClass("tx_reverted", ErrorCause.CHAIN, retryable=False, rotate_proxy=False)
+INSUFFICIENT_FUNDS = ErrorClass("insufficient_funds", ErrorCause.CHAIN, retryable=False, rotate_proxy=False)
+API_REJECTED = ErrorClass("api_rejected", ErrorCause.API, retryable=False, rotate_proxy=False)
+# Unrecognized errors keep the old behaviour: new proxy and error_delay
+UNKNOWN_ERROR = ErrorClass("unknown", ErrorCause.UNKNOWN, retryable=True, rotate_proxy=True)
+
+# Checked in order, the first matching type wins
+_TYPE_RULES: tuple[tuple[type[BaseException] | tuple[type[BaseException], ...], ErrorClass], ...] = (
+    (ProxyForbidden, PROXY_FORBIDDEN),
+    (NoAvailableProxies, NO_PROXIES),
+    ((ClientHttpProxyError, ClientProxyConnectionError), PROXY_FAILED),
+    (ServerError, SERVER_ERROR),
+    (CaptchaSolvingFailed, CAPTCHA_FAILED),
+    (ContractLogicError, TX_REVERTED),
+    (TimeExhausted, TX_NOT_CONFIRMED),
+    (asyncio.TimeoutError, PROXY_FAILED),
+)
+
+# Message patterns, checked in order when no type rule matched. Chain errors come before the
+# generic transport ones, a node answering "nonce too low" says nothing about the proxy
+_MESSAGE_RULES: tuple[tuple[re.Pattern, ErrorClass], ...] = (
+    (re.compile(r"nonce too low|replacement transaction underpriced|already known|nonce too high"), NONCE_CONFLICT),
+    (re.compile(r"insufficient funds|exceeds balance"), INSUFFICIENT_FUNDS),
+    (re.compile(r"execution reverted"), TX_REVERTED),
+    (re.compile(r"\b429\b|rate limit|too many requests"), RATE_LIMITED),
+    (re.compile(r"captcha"), CAPTCHA_FAILED),
+    (re.compile(r"empty document|expecting value|failed to decode"), EMPTY_RESPONSE),
+    (re.compile(r"server error|\b50[0234]\b|bad gateway|service unavailable|gateway time-?out"), SERVER_ERROR),
+    (
+        re.compile(
+            r"curl: \((?:5|7|16|28|35|56|97)\)|connect tunnel failed|unsuccessful tunnel|proxy|\b407\b"
+            r"|timed out|connection (?:refused|reset|error|aborted)|ssl|\beof\b|403 forbidden"
+        ),
+        PROXY_FAILED,
+    ),
+)
+
+
+def classify_error(error: BaseException) -> ErrorClass:
+    if isinstance(error, RateLimitExceeded):
+        return replace(RATE_LIMITED, backoff=max(float(error.reset_time), 1.0))
+
+    if isinstance(error, APIError):
+        if error.error_type == APIErrorType.INVALID_CAPTCHA:
+            return INVALID_CAPTCHA
+        if "rate limit" in error.error.lower():
+            return RATE_LIMITED
+        return API_REJECTED
+
+    for error_types, error_class in _TYPE_RULES:
+        if isinstance(error, error_types):
+            return error_class
+
+    message = str(error).lower()
+    for pattern, error_class in _MESSAGE_RULES:
+        if pattern.search(message):
+            return error_class
+
+    return UNKNOWN_ERROR
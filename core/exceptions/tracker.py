@@ -1,7 +1,6 @@
-from collections import defaultdict
+from collections import deque
 import time
-from dataclasses import dataclass
-from typing import DefaultDict, List
+from typing import Deque, Dict
 
 
 class TooManyErrorsException(Exception):
@@ -9,12 +8,6 @@ class TooManyErrorsException(Exception):
     pass
 
 
-@dataclass
-class ErrorOccurrence:
-    error_type: str
-    timestamp: float
-
-
 class ErrorTracker:
     def __init__(self, max_errors: int = 3, time_window: int = 60):
         """
@@ -26,7 +19,28 @@ class ErrorTracker:
         """
         self.max_errors = max_errors
         self.time_window = time_window
-        self.errors: DefaultDict[str, List[ErrorOccurrence]] = defaultdict(list)
+        self.errors: Dict[str, Deque[float]] = {}
+
+    def record(self, error: Exception | str) -> int:
+        """
+        Add an error occurrence without raising
+
+        Args:
+            error: The exception that occurred or its class name
+
+        Returns:
+            Number of errors of the same type in time window
+        """
+        now = time.monotonic()
+        error_type = error if isinstance(error, str) else type(error).__name__
+
+        occurrences = self.errors.get(error_type)
+        if occurrences is None:
+            occurrences = self.errors[error_type] = deque()
+
+        occurrences.append(now)
+        self._expire(occurrences, now)
+        return len(occurrences)
 
     def add_error(self, error: Exception) -> None:
         """
@@ -38,31 +52,41 @@ class ErrorTracker:
         Raises:
             TooManyErrorsException: If too many similar errors occur in time window
         """
-        now = time.time()
-        error_type = type(error).__name__
-
-        self.errors[error_type].append(ErrorOccurrence(error_type, now))
-        self._clean_old_errors(now)
-
-        if len(self.errors[error_type]) >= self.max_errors:
-            if error:
-                raise TooManyErrorsException(
-                    f"Too many {error_type} errors: {len(self.errors[error_type])} in last {self.time_window} seconds. "
-                    f"Last error: {str(error)}"
-                )
-            else:
-                raise TooManyErrorsException(
-                    f"Too many {error_type} errors: {len(self.errors[error_type])} in last {self.time_window} seconds."
-                )
-
-    def _clean_old_errors(self, current_time: float) -> None:
-        cutoff_time = current_time - self.time_window
+        count = self.record(error)
 
-        for error_type in list(self.errors.keys()):
-            self.errors[error_type] = [
-                err for err in self.errors[error_type]
-                if err.timestamp > cutoff_time
-            ]
+        if count >= self.max_errors:
+            raise TooManyErrorsException(
+                f"Too many {type(error).__name__} errors: {count} in last {self.time_window} seconds. "
+                f"Last error: {str(error)}"
+            )
 
+    def count(self, error_type: str) -> int:
+        """
+        Number of errors of the given type in time window
+        """
+        occurrences = self.errors.get(error_type)
+        if occurrences is None:
+            return 0
+
+        self._expire(occurrences, time.monotonic())
+        return len(occurrences)
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Number of errors per type in time window, types without recent errors are dropped
+        """
+        now = time.monotonic()
+
+        for error_type in list(self.errors):
+            self._expire(self.errors[error_type], now)
             if not self.errors[error_type]:
                 del self.errors[error_type]
+
+        return {error_type: len(occurrences) for error_type, occurrences in self.errors.items()}
+
+    def _expire(self, occurrences: Deque[float], current_time: float) -> None:
+        # Occurrences are appended in time order, so only the left end can be outdated
+        cutoff_time = current_time - self.time_window
+
+        while occurrences and occurrences[0] <= cutoff_time:
+            occurrences.popleft()
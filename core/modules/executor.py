@@ -1,38 +1,57 @@
+import time
+
 from core.bot.base import Bot
-from loader import file_operations
-from models import Account
+from database import Accounts
+from loader import config, file_operations
+from models import Account, ModuleType, OperationResult
 
 
 class ModuleExecutor:
-    def __init__(self, account: Account = None):
+    def __init__(self, account: Account = None, db_account: Accounts = None, run_id: int = None):
         self.account = account
-        self.bot = Bot(account)
+        self.run_id = run_id
+        self.bot = Bot(account, db_account)
+
+    async def cleanup(self) -> None:
+        await self.bot.release_proxy()
+
+    def _build_record(self, operation_result: OperationResult | None, module: ModuleType) -> dict:
+        return {
+            "run_id": self.run_id,
+            "wallet_address": self.account.wallet_address,
+            "module": module,
+            "status": "success" if isinstance(operation_result, dict) and operation_result.get("status") else "failed",
+            "finished_at": round(time.time(), 3),
+            "tasks": [report.to_record() for report in self.bot.reports],
+        }
+
+    async def _export(self, operation_result: OperationResult | None, module: ModuleType) -> None:
+        if isinstance(operation_result, dict):
+            await file_operations.export_result(operation_result, module)
+
+        if config.results_settings.records:
+            await file_operations.export_record(self._build_record(operation_result, module), module)
 
     async def _process_request_tokens_from_faucet(self) -> None:
         operation_result = await self.bot.process_request_tokens_from_faucet()
-        if isinstance(operation_result, dict):
-            await file_operations.export_result(operation_result, "request_tokens")
+        await self._export(operation_result, "request_tokens")
 
 
     async def _process_top_up_game_balance(self) -> None:
         operation_result = await self.bot.process_top_up_game_balance()
-        if isinstance(operation_result, dict):
-            await file_operations.export_result(operation_result, "top_up_game_balance")
+        await self._export(operation_result, "top_up_game_balance")
 
 
     async def _process_play_games(self) -> None:
         operation_result = await self.bot.process_play_games()
-        if isinstance(operation_result, dict):
-            await file_operations.export_result(operation_result, "play_games")
+        await self._export(operation_result, "play_games")
 
 
     async def _process_mint_omnihub_nft(self) -> None:
         operation_result = await self.bot.process_mint_omnihub_nft()
-        if isinstance(operation_result, dict):
-            await file_operations.export_result(operation_result, "mint_nft")
+        await self._export(operation_result, "mint_nft")
 
 
     async def _process_all_in_one(self) -> None:
         operation_result = await self.bot.process_all_in_one()
-        if isinstance(operation_result, dict):
-            await file_operations.export_result(operation_result, "all_in_one")
+        await self._export(operation_result, "all_in_one")
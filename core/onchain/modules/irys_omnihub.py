@@ -5,8 +5,8 @@ from web3.types import TxParams
 
 
 class IrysOmnihubModule(Web3Wallet):
-    def __init__(self, private_key: str, rpc_url: str, proxy: str = None):
-        super().__init__(private_key, rpc_url, proxy)
+    def __init__(self, private_key: str, rpc_url: str, proxy: str = None, **kwargs):
+        super().__init__(private_key, rpc_url, proxy, **kwargs)
         self.proxy = proxy
 
     async def mint_nft(self):
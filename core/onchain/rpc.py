@@ -0,0 +1,255 @@
+import asyncio
+import time
+
+from collections import deque
+from typing import Any, Optional, TYPE_CHECKING
+
+from aiohttp import ClientHttpProxyError, ClientProxyConnectionError
+from web3 import AsyncHTTPProvider
+from web3.providers.async_base import AsyncJSONBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from utils.monitoring.metrics import rpc_request_seconds
+from utils.monitoring.tracing import tracer
+from utils.processing.reports import add_stage_time
+
+if TYPE_CHECKING:
+    from utils.managers.proxy_manager import ProxyManager
+
+
+IDEMPOTENT_METHODS = frozenset({
+    "eth_blockNumber",
+    "eth_call",
+    "eth_chainId",
+    "eth_estimateGas",
+    "eth_gasPrice",
+    "eth_getBalance",
+    "eth_getBlockByNumber",
+    "eth_getTransactionByHash",
+    "eth_getTransactionCount",
+    "eth_getTransactionReceipt",
+    "eth_maxPriorityFeePerGas",
+    "net_version",
+    "web3_clientVersion",
+})
+
+BROADCAST_METHODS = frozenset({"eth_sendRawTransaction"})
+
+
+class RPCEndpointStats:
+    def __init__(self, url: str, alpha: float, max_error_rate: float, cooldown: float):
+        self.url = url
+        self.alpha = alpha
+        self.max_error_rate = max_error_rate
+        self.cooldown = cooldown
+
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.cooldown_until = 0.0
+        self.samples: deque[float] = deque(maxlen=200)
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+    @property
+    def score(self) -> float:
+        # Endpoints without samples score 0 so every node gets probed at least once,
+        # recent errors push a node behind the ones that answer, whatever their latency
+        return (self.latency or 0.0) + self.error_rate * self.cooldown
+
+    def observe(self, latency: float, success: bool) -> None:
+        if success:
+            self.samples.append(latency)
+            self.latency = latency if self.latency is None else self.alpha * latency + (1 - self.alpha) * self.latency
+
+        self.error_rate = self.alpha * (0.0 if success else 1.0) + (1 - self.alpha) * self.error_rate
+        if not success and self.error_rate >= self.max_error_rate:
+            self.cooldown_until = time.monotonic() + self.cooldown
+
+    def observe_lower_bound(self, elapsed: float) -> None:
+        # The request was cut short, so the node is at least this slow. The estimate may only go up,
+        # and neither the samples nor the error rate change
+        if self.latency is None or elapsed > self.latency:
+            self.latency = elapsed
+
+    def percentile(self, q: float) -> Optional[float]:
+        if len(self.samples) < 10:
+            return None
+
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class RPCPool:
+    def __init__(
+        self,
+        urls: list[str],
+        hedge_reads: bool = False,
+        broadcast_fanout: int = 2,
+        alpha: float = 0.2,
+        max_error_rate: float = 0.5,
+        cooldown: float = 30.0,
+        default_hedge_delay: float = 1.0,
+    ):
+        if not urls:
+            raise ValueError("At least one RPC endpoint is required")
+
+        self.endpoints = [
+            RPCEndpointStats(url, alpha, max_error_rate, cooldown)
+            for url in dict.fromkeys(urls)
+        ]
+        self.hedge_reads = hedge_reads
+        self.broadcast_fanout = broadcast_fanout
+        self.default_hedge_delay = default_hedge_delay
+
+    def ranked(self) -> list[RPCEndpointStats]:
+        healthy = sorted((endpoint for endpoint in self.endpoints if endpoint.healthy), key=lambda e: e.score)
+        cooling = sorted((endpoint for endpoint in self.endpoints if not endpoint.healthy), key=lambda e: e.cooldown_until)
+        return healthy + cooling
+
+    def hedge_delay(self, endpoint: RPCEndpointStats) -> float:
+        p95 = endpoint.percentile(0.95)
+        return p95 if p95 is not None else self.default_hedge_delay
+
+
+class PooledHTTPProvider(AsyncJSONBaseProvider):
+    def __init__(self, pool: RPCPool, request_kwargs: dict = None, proxy_manager: "ProxyManager" = None, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.pool = pool
+        self.proxy = (request_kwargs or {}).get("proxy")
+        self.proxy_manager = proxy_manager
+        self.providers = {
+            endpoint.url: AsyncHTTPProvider(endpoint_uri=endpoint.url, request_kwargs=request_kwargs)
+            for endpoint in pool.endpoints
+        }
+        self._background: set[asyncio.Task] = set()
+
+    def __str__(self) -> str:
+        return f"Pooled RPC connection ({len(self.providers)} endpoints)"
+
+    async def _request(self, endpoint: RPCEndpointStats, method: RPCEndpoint, params: Any) -> RPCResponse:
+        started = time.monotonic()
+        try:
+            response = await self.providers[endpoint.url].make_request(method, params)
+        except asyncio.CancelledError:
+            # A request that lost a hedge still tells how slow the node is, count it as a lower bound
+            endpoint.observe_lower_bound(time.monotonic() - started)
+            raise
+        except (ClientHttpProxyError, ClientProxyConnectionError):
+            # The node was never reached, so only the proxy is to blame
+            self._report_proxy(False)
+            raise
+        except Exception:
+            endpoint.observe(time.monotonic() - started, False)
+            raise
+
+        latency = time.monotonic() - started
+        endpoint.observe(latency, True)
+        self._report_proxy(True, latency)
+        return response
+
+    def _report_proxy(self, success: bool, latency: float = None) -> None:
+        if self.proxy and self.proxy_manager:
+            self.proxy_manager.report(self.proxy, success, latency)
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        started = time.monotonic()
+        result = "error"
+        try:
+            response = await self._route(method, params)
+            result = "error" if "error" in response else "ok"
+            return response
+        finally:
+            elapsed = time.monotonic() - started
+            add_stage_time("rpc", elapsed)
+            rpc_request_seconds.observe(elapsed, method=method, result=result)
+            tracer.add_span("rpc", "rpc", started, elapsed, method=method, result=result)
+
+    async def _route(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        endpoints = self.pool.ranked()
+
+        if method in BROADCAST_METHODS:
+            return await self._broadcast(endpoints[:self.pool.broadcast_fanout], method, params)
+
+        if method not in IDEMPOTENT_METHODS or len(endpoints) == 1:
+            return await self._request(endpoints[0], method, params)
+
+        if self.pool.hedge_reads:
+            return await self._hedged(endpoints[0], endpoints[1], method, params)
+
+        try:
+            return await self._request(endpoints[0], method, params)
+        except Exception:
+            return await self._request(endpoints[1], method, params)
+
+    async def _hedged(self, primary: RPCEndpointStats, secondary: RPCEndpointStats, method: RPCEndpoint, params: Any) -> RPCResponse:
+        first = asyncio.create_task(self._request(primary, method, params))
+        await asyncio.wait({first}, timeout=self.pool.hedge_delay(primary))
+
+        if first.done() and first.exception() is None:
+            return first.result()
+
+        # Hedge fires either because the primary is slower than its p95 or because it already failed
+        pending = {asyncio.create_task(self._request(secondary, method, params))}
+        if not first.done():
+            pending.add(first)
+
+        error = first.exception() if first.done() else None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _broadcast(self, endpoints: list[RPCEndpointStats], method: RPCEndpoint, params: Any) -> RPCResponse:
+        tasks = [asyncio.create_task(self._request(endpoint, method, params)) for endpoint in endpoints]
+        rejected, error = None, None
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    response = await next_done
+                except Exception as exc:
+                    error = exc
+                    continue
+
+                if "error" not in response:
+                    return response
+                rejected = rejected or response
+
+            if rejected is not None:
+                return rejected
+            raise error
+
+        finally:
+            # Slower nodes keep propagating the transaction in the background
+            for task in tasks:
+                if not task.done():
+                    self._background.add(task)
+                    task.add_done_callback(self._discard_background)
+
+    def _discard_background(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled():
+            task.exception()
+
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        for provider in self.providers.values():
+            if await provider.is_connected(show_traceback):
+                return True
+        return False
+
+    async def disconnect(self) -> None:
+        for task in self._background:
+            task.cancel()
+
+        for provider in self.providers.values():
+            await provider.disconnect()
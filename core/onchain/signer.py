@@ -0,0 +1,152 @@
+import asyncio
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Literal, Optional
+
+from eth_account import Account
+from eth_account.messages import encode_defunct
+
+
+SigningMode = Literal["inline", "thread", "process"]
+
+
+def sign_message(private_key: bytes | str, message: str) -> str:
+    signed_message = Account.sign_message(encode_defunct(text=message), private_key)
+    signature = signed_message.signature.hex()
+    return signature if signature.startswith("0x") else "0x" + signature
+
+
+def sign_transaction(private_key: bytes | str, transaction: dict) -> bytes:
+    signed = Account.sign_transaction(transaction, private_key)
+    return bytes(signed.raw_transaction)
+
+
+def sign_batch(requests: list[tuple[str, bytes | str, Any]]) -> list[tuple[bool, Any]]:
+    # Runs inside the worker, so errors are returned as strings instead of raised:
+    # one bad request must not fail the whole batch and exceptions may not pickle
+    results = []
+
+    for kind, private_key, payload in requests:
+        try:
+            if kind == "message":
+                results.append((True, sign_message(private_key, payload)))
+            else:
+                results.append((True, sign_transaction(private_key, payload)))
+        except Exception as error:
+            results.append((False, f"{type(error).__name__}: {error}"))
+
+    return results
+
+
+class SigningService:
+    def __init__(self, mode: SigningMode = "process", workers: int = 2, max_batch_size: int = 32):
+        self.mode = mode
+        self.workers = workers
+        self.max_batch_size = max_batch_size
+
+        self._executor: Optional[Executor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def _ensure_started(self) -> None:
+        if self._dispatcher is not None and not self._dispatcher.done():
+            return
+
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="signer")
+
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def sign_message(self, private_key: bytes | str, message: str) -> str:
+        if self.mode == "inline":
+            return sign_message(private_key, message)
+
+        return await self._submit("message", private_key, message)
+
+    async def sign_transaction(self, private_key: bytes | str, transaction: dict) -> bytes:
+        if self.mode == "inline":
+            return sign_transaction(private_key, transaction)
+
+        return await self._submit("transaction", private_key, dict(transaction))
+
+    async def _submit(self, kind: str, private_key: bytes | str, payload: Any) -> Any:
+        self._ensure_started()
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((kind, private_key, payload, future))
+        return await future
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            # A batch is cut only once a worker is free, so requests pile up
+            # in the queue while all workers are busy and go out together
+            await self._slots.acquire()
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            requests = [(kind, private_key, payload) for kind, private_key, payload, _ in batch]
+            futures = [future for *_, future in batch]
+
+            try:
+                execution = loop.run_in_executor(self._executor, sign_batch, requests)
+            except Exception as error:
+                self._slots.release()
+                self._fail(futures, error)
+                continue
+
+            execution.add_done_callback(lambda done, pending=futures: self._resolve(done, pending))
+
+    def _resolve(self, execution: asyncio.Future, futures: list[asyncio.Future]) -> None:
+        self._slots.release()
+
+        if execution.cancelled():
+            for future in futures:
+                future.cancel()
+            return
+
+        if execution.exception() is not None:
+            self._fail(futures, execution.exception())
+            return
+
+        for future, (success, value) in zip(futures, execution.result()):
+            if future.done():
+                continue
+
+            if success:
+                future.set_result(value)
+            else:
+                future.set_exception(Exception(f"Signing failed: {value}"))
+
+    @staticmethod
+    def _fail(futures: list[asyncio.Future], error: BaseException) -> None:
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
+
+    async def shutdown(self) -> None:
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                *_, future = self._queue.get_nowait()
+                if not future.done():
+                    future.cancel()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -1,3 +1,5 @@
+import time
+
 from datetime import datetime, timezone
 
 from eth_account import Account
@@ -9,22 +11,49 @@ from web3.contract import AsyncContract
 from web3.eth import AsyncEth
 from web3.types import Nonce, TxParams
 
-from typing import Any
+from typing import Any, TYPE_CHECKING
 from loguru import logger
 
+from core.onchain.rpc import RPCPool, PooledHTTPProvider
+from core.onchain.signer import SigningService
+from utils.monitoring.metrics import tx_confirmation_seconds
+from utils.monitoring.tracing import tracer
+from utils.processing.reports import add_stage_time
+
+if TYPE_CHECKING:
+    from utils.managers.proxy_manager import ProxyManager
+
 
 class Web3Wallet(AsyncWeb3, Account):
-    def __init__(self, private_key: str, rpc_url: str = None, proxy: str = None):
-        self.web3_provider = AsyncHTTPProvider(
-            endpoint_uri=rpc_url if rpc_url else None,
-            request_kwargs={
-                "proxy": proxy if proxy else None,
-                "ssl": False
-            }
-        )
+    def __init__(
+        self,
+        private_key: str,
+        rpc_url: str = None,
+        proxy: str = None,
+        signer: SigningService = None,
+        rpc_pool: RPCPool = None,
+        proxy_manager: "ProxyManager" = None,
+    ):
+        request_kwargs = {
+            "proxy": proxy if proxy else None,
+            "ssl": False
+        }
+
+        if rpc_pool:
+            self.web3_provider = PooledHTTPProvider(
+                pool=rpc_pool,
+                request_kwargs=request_kwargs,
+                proxy_manager=proxy_manager
+            )
+        else:
+            self.web3_provider = AsyncHTTPProvider(
+                endpoint_uri=rpc_url if rpc_url else None,
+                request_kwargs=request_kwargs
+            )
 
         super().__init__(provider=self.web3_provider, modules={"eth": (AsyncEth,)})
         self.keypair = self.from_key(private_key)
+        self.signer = signer
 
     @property
     def wallet_address(self):
@@ -35,6 +64,9 @@ class Web3Wallet(AsyncWeb3, Account):
         return float(AsyncWeb3.from_wei(balance, "ether"))
 
     async def get_signature(self, message: str) -> str:
+        if self.signer:
+            return await self.signer.sign_message(self.keypair.key, message)
+
         encoded_message = encode_defunct(text=message)
         signed_message = self.keypair.sign_message(encoded_message)
         signature = signed_message.signature.hex()
@@ -56,9 +88,24 @@ class Web3Wallet(AsyncWeb3, Account):
             return False, str(error)
 
     async def send_and_verify_transaction(self, trx: Any) -> tuple[bool | Any, str]:
-        signed = self.keypair.sign_transaction(trx)
-        tx_hash = await self.eth.send_raw_transaction(signed.raw_transaction)
-        receipt = await self.eth.wait_for_transaction_receipt(tx_hash)
+        if self.signer:
+            raw_transaction = await self.signer.sign_transaction(self.keypair.key, trx)
+        else:
+            raw_transaction = self.keypair.sign_transaction(trx).raw_transaction
+
+        tx_hash = await self.eth.send_raw_transaction(raw_transaction)
+
+        started = time.monotonic()
+        result = "error"
+        try:
+            receipt = await self.eth.wait_for_transaction_receipt(tx_hash)
+            result = "confirmed" if receipt["status"] == 1 else "reverted"
+        finally:
+            elapsed = time.monotonic() - started
+            add_stage_time("confirmation", elapsed)
+            tx_confirmation_seconds.observe(elapsed, result=result)
+            tracer.add_span("confirmation", "rpc", started, elapsed, tx_hash=tx_hash.hex(), result=result)
+
         return receipt["status"] == 1, tx_hash.hex()
 
     async def cleanup(self):
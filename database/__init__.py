@@ -1,2 +1,3 @@
-from .models import Accounts
-from .settings import initialize_database
+from .models import Accounts, Runs, TaskExecutions
+from .settings import initialize_database, close_database, write_behind
+from .queries import AccountQueries, AccountRow
@@ -1 +1,2 @@
 from .accounts import Accounts
+from .runs import Runs, TaskExecutions
@@ -1,10 +1,15 @@
-import asyncio
+import itertools
 import random
 
 import pytz
 from datetime import datetime
+from typing import ClassVar, Optional
+
 from tortoise import Model, fields
 from tortoise.expressions import Q
+from tortoise.transactions import in_transaction
+
+from database.write_behind import WriteBehindQueue
 
 
 class Accounts(Model):
@@ -12,9 +17,18 @@ class Accounts(Model):
     private_key = fields.CharField(max_length=1024)
     active_account_proxy = fields.CharField(max_length=255, null=True)
 
+    # Set on startup, row updates from running accounts are queued instead of saved right away
+    write_behind: ClassVar[Optional[WriteBehindQueue]] = None
+
     class Meta:
         table = "irys_accounts"
 
+    async def _persist(self, *update_fields: str) -> None:
+        if self.write_behind is not None and self.pk is not None:
+            self.write_behind.enqueue(self, list(update_fields))
+        else:
+            await self.save()
+
     @classmethod
     async def get_account(cls, wallet_address: str):
         return await cls.get_or_none(wallet_address=wallet_address)
@@ -23,9 +37,55 @@ class Accounts(Model):
     async def get_accounts(cls):
         return await cls.all()
 
+    @classmethod
+    async def _fetch_by_wallets(cls, wallet_addresses: list[str], chunk_size: int) -> dict[str, "Accounts"]:
+        accounts = {}
+        for start in range(0, len(wallet_addresses), chunk_size):
+            chunk = wallet_addresses[start:start + chunk_size]
+            for account in await cls.filter(wallet_address__in=chunk):
+                accounts[account.wallet_address] = account
+
+        return accounts
+
+    @classmethod
+    async def preload_accounts(
+        cls,
+        private_keys: dict[str, str],
+        proxies: list[str] = None,
+        chunk_size: int = 500,
+    ) -> dict[str, "Accounts"]:
+        # Chunks keep every IN (...) below SQLite's bound parameters limit
+        wallet_addresses = list(private_keys)
+        accounts = await cls._fetch_by_wallets(wallet_addresses, chunk_size)
+        proxy_cycle = itertools.cycle(proxies) if proxies else None
+
+        missing = [wallet for wallet in wallet_addresses if wallet not in accounts]
+        if missing:
+            await cls.bulk_create(
+                [
+                    cls(
+                        wallet_address=wallet,
+                        private_key=private_keys[wallet],
+                        active_account_proxy=next(proxy_cycle) if proxy_cycle else None,
+                    )
+                    for wallet in missing
+                ],
+                batch_size=chunk_size,
+            )
+            # Primary keys are not returned by every backend, so created rows are read back
+            accounts.update(await cls._fetch_by_wallets(missing, chunk_size))
+
+        without_proxy = [account for account in accounts.values() if not account.active_account_proxy]
+        if proxy_cycle and without_proxy:
+            for account in without_proxy:
+                account.active_account_proxy = next(proxy_cycle)
+            await cls.bulk_update(without_proxy, fields=["active_account_proxy"], batch_size=chunk_size)
+
+        return accounts
+
     async def update_account_proxy(self, proxy: str):
         self.active_account_proxy = proxy
-        await self.save()
+        await self._persist("active_account_proxy")
 
     @classmethod
     async def get_account_proxy(cls, wallet_address: str) -> str:
@@ -62,7 +122,7 @@ class Accounts(Model):
         if active_account_proxy is not None:
             self.active_account_proxy = active_account_proxy
 
-        await self.save()
+        await self._persist("active_account_proxy")
         return self
 
     @classmethod
@@ -75,13 +135,62 @@ class Accounts(Model):
 
     @classmethod
     async def clear_all_accounts_proxies(cls) -> int:
-        accounts = await cls.all()
+        return await cls.all().update(active_account_proxy=None)
 
-        async def clear_proxy(account: Accounts):
-            account.active_account_proxy = None
-            await account.save()
+    @classmethod
+    async def get_used_proxies(cls) -> list[str]:
+        return await cls.filter(active_account_proxy__isnull=False).distinct().values_list(
+            "active_account_proxy", flat=True
+        )
 
-        tasks = [asyncio.create_task(clear_proxy(account)) for account in accounts]
-        await asyncio.gather(*tasks)
+    @classmethod
+    async def get_wallet_addresses(cls) -> list[str]:
+        return await cls.all().order_by("id").values_list("wallet_address", flat=True)
 
-        return len(accounts)
+    @classmethod
+    async def release_proxies(cls, proxies: list[str], chunk_size: int = 500) -> int:
+        proxies = list(dict.fromkeys(proxies))
+        released = 0
+
+        async with in_transaction():
+            for start in range(0, len(proxies), chunk_size):
+                released += await cls.filter(
+                    active_account_proxy__in=proxies[start:start + chunk_size]
+                ).update(active_account_proxy=None)
+
+        return released
+
+    @classmethod
+    async def reassign_proxies(cls, assignments: dict[str, str], chunk_size: int = 300) -> int:
+        # One UPDATE ... CASE per chunk instead of a save() per account,
+        # each row takes three bound parameters so chunks stay below SQLite's limit
+        items = list(assignments.items())
+        table = cls._meta.db_table
+        updated = 0
+
+        async with in_transaction() as connection:
+            postgres = connection.capabilities.dialect == "postgres"
+
+            for start in range(0, len(items), chunk_size):
+                chunk = items[start:start + chunk_size]
+                values = [value for pair in chunk for value in pair] + [wallet for wallet, _ in chunk]
+
+                if postgres:
+                    placeholders = [f"${index}" for index in range(1, len(values) + 1)]
+                else:
+                    placeholders = ["?"] * len(values)
+
+                cases = " ".join(
+                    f"WHEN {placeholders[2 * index]} THEN {placeholders[2 * index + 1]}"
+                    for index in range(len(chunk))
+                )
+                wallets = ", ".join(placeholders[2 * len(chunk):])
+
+                rows, _ = await connection.execute_query(
+                    f'UPDATE "{table}" SET "active_account_proxy" = CASE "wallet_address" {cases} END '
+                    f'WHERE "wallet_address" IN ({wallets})',
+                    values,
+                )
+                updated += rows
+
+        return updated
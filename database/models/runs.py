@@ -0,0 +1,101 @@
+from typing import Optional
+
+from tortoise import Model, fields
+from tortoise.functions import Count
+from tortoise.timezone import now
+
+from utils.processing.reports import TaskReport
+
+
+class Runs(Model):
+    module = fields.CharField(max_length=64)
+    status = fields.CharField(max_length=16, default="running")
+    accounts_count = fields.IntField(default=0)
+    started_at = fields.DatetimeField(auto_now_add=True)
+    finished_at = fields.DatetimeField(null=True)
+
+    class Meta:
+        table = "irys_runs"
+
+    @classmethod
+    async def start_run(cls, module: str, accounts_count: int) -> "Runs":
+        return await cls.create(module=module, accounts_count=accounts_count)
+
+    @classmethod
+    async def get_latest_runs(cls, limit: int = 5) -> list["Runs"]:
+        return await cls.all().order_by("-id").limit(limit)
+
+    async def finish_run(self, status: str = "finished") -> None:
+        self.status = status
+        self.finished_at = now()
+        await self.save(update_fields=["status", "finished_at"])
+
+
+class TaskExecutions(Model):
+    run = fields.ForeignKeyField("models.Runs", related_name="tasks", on_delete=fields.CASCADE)
+    module = fields.CharField(max_length=64)
+    wallet_address = fields.CharField(max_length=255)
+    task = fields.CharField(max_length=64)
+    status = fields.CharField(max_length=16)
+    error_class = fields.CharField(max_length=128, null=True)
+    tx_hash = fields.CharField(max_length=128, null=True)
+    captcha_time = fields.FloatField(default=0)
+    rpc_time = fields.FloatField(default=0)
+    duration = fields.FloatField(default=0)
+    attempts = fields.IntField(default=0)
+    proxy = fields.CharField(max_length=255, null=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "irys_task_executions"
+        indexes = (("run_id", "status"), ("run_id", "task"), ("wallet_address", "task"))
+
+    @classmethod
+    def from_report(cls, run: Runs, module: str, report: TaskReport) -> "TaskExecutions":
+        return cls(
+            run=run,
+            module=module,
+            wallet_address=report.wallet_address,
+            task=report.task,
+            status=report.status,
+            error_class=report.error_class,
+            tx_hash=report.tx_hash,
+            captcha_time=round(report.captcha_time, 4),
+            rpc_time=round(report.rpc_time, 4),
+            duration=round(report.duration, 4),
+            attempts=report.attempts,
+            proxy=report.proxy,
+        )
+
+    @classmethod
+    async def get_stage_percentiles(
+        cls,
+        run_id: int,
+        task: str,
+        stage: str,
+        quantiles: tuple[float, ...] = (0.5, 0.95, 0.99),
+        count: Optional[int] = None,
+    ) -> Optional[dict[float, float]]:
+        # One ORDER BY ... LIMIT 1 OFFSET n query per quantile, only the picked values leave the database.
+        # Pass `count` when the number of rows for the task is already known to skip the COUNT query
+        query = cls.filter(run_id=run_id, task=task)
+        if count is None:
+            count = await query.count()
+        if not count:
+            return None
+
+        percentiles = {}
+        for q in quantiles:
+            offset = min(count - 1, int(q * count))
+            values = await query.order_by(stage).offset(offset).limit(1).values_list(stage, flat=True)
+            percentiles[q] = values[0]
+        return percentiles
+
+    @classmethod
+    async def get_run_summary(cls, run_id: int) -> list[dict]:
+        return await (
+            cls.filter(run_id=run_id)
+            .annotate(count=Count("id"))
+            .group_by("task", "status")
+            .values("task", "status", "count")
+        )
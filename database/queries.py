@@ -0,0 +1,105 @@
+from typing import Optional
+
+from tortoise import Tortoise
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from database.models import Accounts
+
+
+class AccountRow:
+    # Plain row with the Accounts update methods the bot uses, without model hydration
+    __slots__ = ("id", "wallet_address", "private_key", "active_account_proxy")
+
+    def __init__(self, id: int, wallet_address: str, private_key: str, active_account_proxy: Optional[str]):
+        self.id = id
+        self.wallet_address = wallet_address
+        self.private_key = private_key
+        self.active_account_proxy = active_account_proxy
+
+    @property
+    def pk(self) -> int:
+        return self.id
+
+    @classmethod
+    async def bulk_update(cls, rows: list["AccountRow"], fields: list[str], batch_size: int = 300) -> int:
+        # Called by the write-behind queue, rows only ever change their proxy
+        return await Accounts.reassign_proxies(
+            {row.wallet_address: row.active_account_proxy for row in rows}, chunk_size=batch_size
+        )
+
+    async def update_account_proxy(self, proxy: str) -> None:
+        self.active_account_proxy = proxy
+
+        if Accounts.write_behind is not None:
+            Accounts.write_behind.enqueue(self, ["active_account_proxy"])
+        else:
+            await AccountQueries.update_proxy(self.wallet_address, proxy)
+
+    async def update_account(self, active_account_proxy: str = None) -> "AccountRow":
+        if active_account_proxy is not None:
+            await self.update_account_proxy(active_account_proxy)
+        return self
+
+
+class AccountQueries:
+    # Statement text is built once per dialect and reused, so asyncpg's prepared statement
+    # cache and sqlite3's statement cache hit on every call after the first one
+    COLUMNS = '"id", "wallet_address", "private_key", "active_account_proxy"'
+    STATEMENTS = {
+        "get_by_wallet": 'SELECT {columns} FROM "{table}" WHERE "wallet_address" = {p1}',
+        "get_proxy": 'SELECT "active_account_proxy" FROM "{table}" WHERE "wallet_address" = {p1}',
+        "update_proxy": 'UPDATE "{table}" SET "active_account_proxy" = {p1} WHERE "wallet_address" = {p2}',
+        "upsert": (
+            'INSERT INTO "{table}" ("wallet_address", "private_key", "active_account_proxy") '
+            "VALUES ({p1}, {p2}, {p3}) "
+            'ON CONFLICT ("wallet_address") DO UPDATE SET '
+            '"private_key" = COALESCE(excluded."private_key", "{table}"."private_key"), '
+            '"active_account_proxy" = COALESCE(excluded."active_account_proxy", "{table}"."active_account_proxy") '
+            "RETURNING {columns}"
+        ),
+    }
+
+    _cache: dict[tuple[str, str], str] = {}
+
+    @classmethod
+    def _connection(cls) -> BaseDBAsyncClient:
+        return Tortoise.get_connection("default")
+
+    @classmethod
+    def _statement(cls, connection: BaseDBAsyncClient, name: str) -> str:
+        dialect = connection.capabilities.dialect
+        statement = cls._cache.get((dialect, name))
+
+        if statement is None:
+            placeholders = {f"p{index}": f"${index}" if dialect == "postgres" else "?" for index in range(1, 4)}
+            statement = cls.STATEMENTS[name].format(
+                table=Accounts._meta.db_table, columns=cls.COLUMNS, **placeholders
+            )
+            cls._cache[(dialect, name)] = statement
+
+        return statement
+
+    @classmethod
+    async def _fetch_row(cls, name: str, values: list) -> Optional[AccountRow]:
+        connection = cls._connection()
+        rows = await connection.execute_query_dict(cls._statement(connection, name), values)
+        return AccountRow(**rows[0]) if rows else None
+
+    @classmethod
+    async def get_by_wallet(cls, wallet_address: str) -> Optional[AccountRow]:
+        return await cls._fetch_row("get_by_wallet", [wallet_address])
+
+    @classmethod
+    async def get_proxy(cls, wallet_address: str) -> str:
+        connection = cls._connection()
+        rows = await connection.execute_query_dict(cls._statement(connection, "get_proxy"), [wallet_address])
+        return (rows[0]["active_account_proxy"] or "") if rows else ""
+
+    @classmethod
+    async def update_proxy(cls, wallet_address: str, proxy: Optional[str]) -> None:
+        connection = cls._connection()
+        await connection.execute_query(cls._statement(connection, "update_proxy"), [proxy, wallet_address])
+
+    @classmethod
+    async def upsert(cls, wallet_address: str, private_key: str, active_account_proxy: str = None) -> AccountRow:
+        return await cls._fetch_row("upsert", [wallet_address, private_key, active_account_proxy])
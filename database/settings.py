@@ -5,11 +5,19 @@ from tortoise.backends import asyncpg
 from loader import config
 from sys import exit
 
+from database.models import Accounts
+from database.write_behind import WriteBehindQueue
+
 import tortoise.backends
 import asyncpg.pgproto.pgproto
 import asyncpg.pgproto
 
 
+write_behind = WriteBehindQueue(
+    flush_interval=config.database_settings.flush_interval,
+    max_pending=config.database_settings.max_pending_writes,
+)
+
 
 async def initialize_database() -> None:
     print(type(asyncpg), type(asyncpg.pgproto), type(asyncpg.pgproto.pgproto))
@@ -22,12 +30,16 @@ async def initialize_database() -> None:
 
         await Tortoise.init(
             db_url=config.application_settings.database_url,
-            modules={"models": ["database.models.accounts"]},
+            modules={"models": ["database.models.accounts", "database.models.runs"]},
             timezone="UTC",
         )
 
         await Tortoise.generate_schemas(safe=True)
 
+        if config.database_settings.write_behind:
+            Accounts.write_behind = write_behind
+            write_behind.start()
+
     except Exception as error:
         logger.error(f"Error while initializing database: {error}")
 
@@ -37,3 +49,14 @@ async def initialize_database() -> None:
             logger.error(f"Error while closing database connections: {close_error}")
 
         exit(1)
+
+
+async def close_database() -> None:
+    if Accounts.write_behind is not None:
+        await write_behind.close()
+        logger.debug(f"Database write-behind stats: {write_behind.stats()}")
+
+    try:
+        await Tortoise.close_connections()
+    except Exception as error:
+        logger.error(f"Error while closing database connections: {error}")
@@ -0,0 +1,200 @@
+import asyncio
+import time
+
+from collections import defaultdict
+from typing import Optional
+
+from loguru import logger
+from tortoise import Model
+from tortoise.transactions import in_transaction
+
+
+class WriteBehindQueue:
+    def __init__(self, flush_interval: float = 1.0, max_pending: int = 500, batch_size: int = 500, max_retries: int = 5):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+
+        # Keyed by row, so a row updated several times before a flush is written once
+        self._pending: dict[tuple[type[Model], int], tuple[Model, set[str]]] = {}
+        self._inserts: list[Model] = []
+        # Failed flushes per queued write, writes that failed before are retried one by one
+        # so a single bad row cannot fail the batch again, and dropped after max_retries
+        self._update_failures: dict[tuple[type[Model], int], int] = {}
+        self._insert_failures: dict[int, int] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        self.enqueued = 0
+        self.written = 0
+        self.inserted = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.dropped = 0
+        self.last_flush_latency = 0.0
+        self.max_flush_latency = 0.0
+        self._total_flush_latency = 0.0
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending) + len(self._inserts)
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def enqueue(self, instance: Model, fields: list[str]) -> None:
+        key = (type(instance), instance.pk)
+        _, pending_fields = self._pending.get(key, (instance, set()))
+        # The newest instance wins, it carries the latest values of every queued field
+        self._pending[key] = (instance, pending_fields | set(fields))
+        self.enqueued += 1
+
+        self._wake_if_full()
+
+    def insert(self, instance: Model) -> None:
+        self._inserts.append(instance)
+        self._wake_if_full()
+
+    def _wake_if_full(self) -> None:
+        if self._wakeup is not None and self.depth >= self.max_pending:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            if not self._pending and not self._inserts:
+                return 0
+
+            pending, self._pending = self._pending, {}
+            inserts, self._inserts = self._inserts, []
+            started = time.monotonic()
+
+            retried_updates = {key: value for key, value in pending.items() if key in self._update_failures}
+            retried_inserts = [instance for instance in inserts if id(instance) in self._insert_failures]
+            pending = {key: value for key, value in pending.items() if key not in retried_updates}
+            inserts = [instance for instance in inserts if id(instance) not in self._insert_failures]
+
+            groups: dict[tuple[type[Model], tuple[str, ...]], list[Model]] = defaultdict(list)
+            for (model, _), (instance, fields) in pending.items():
+                groups[(model, tuple(sorted(fields)))].append(instance)
+
+            new_rows: dict[type[Model], list[Model]] = defaultdict(list)
+            for instance in inserts:
+                new_rows[type(instance)].append(instance)
+
+            written, inserted = 0, 0
+            try:
+                async with in_transaction():
+                    for (model, fields), instances in groups.items():
+                        await model.bulk_update(instances, fields=list(fields), batch_size=self.batch_size)
+
+                    for model, instances in new_rows.items():
+                        await model.bulk_create(instances, batch_size=self.batch_size)
+
+                written, inserted = len(pending), len(inserts)
+
+            except Exception as error:
+                self.failed_flushes += 1
+                logger.error(f"Error while flushing {len(pending) + len(inserts)} queued database writes: {error}")
+                for key, value in pending.items():
+                    self._requeue_update(key, value, error)
+                for instance in inserts:
+                    self._requeue_insert(instance, error)
+
+            for key, (instance, fields) in retried_updates.items():
+                try:
+                    await key[0].bulk_update([instance], fields=sorted(fields))
+                    self._update_failures.pop(key, None)
+                    written += 1
+                except Exception as error:
+                    self._requeue_update(key, (instance, fields), error)
+
+            for instance in retried_inserts:
+                try:
+                    await type(instance).bulk_create([instance])
+                    self._insert_failures.pop(id(instance), None)
+                    inserted += 1
+                except Exception as error:
+                    self._requeue_insert(instance, error)
+
+            if not written and not inserted:
+                return 0
+
+            latency = time.monotonic() - started
+            self.flushes += 1
+            self.written += written
+            self.inserted += inserted
+            self.last_flush_latency = latency
+            self.max_flush_latency = max(self.max_flush_latency, latency)
+            self._total_flush_latency += latency
+            return written + inserted
+
+    def _requeue_update(self, key: tuple[type[Model], int], value: tuple[Model, set[str]], error: Exception) -> None:
+        failures = self._update_failures.get(key, 0) + 1
+        if failures > self.max_retries:
+            self._update_failures.pop(key, None)
+            self.dropped += 1
+            logger.error(f"Dropping queued update of {key[0].__name__} {key[1]} after {self.max_retries} retries: {error}")
+            return
+
+        self._update_failures[key] = failures
+        instance, fields = value
+        newer = self._pending.get(key)
+        if newer is not None:
+            # The row was updated again during the flush, the newer instance carries the latest
+            # values, the fields of the failed write still have to be written with it
+            instance, fields = newer[0], newer[1] | fields
+        self._pending[key] = (instance, fields)
+
+    def _requeue_insert(self, instance: Model, error: Exception) -> None:
+        failures = self._insert_failures.get(id(instance), 0) + 1
+        if failures > self.max_retries:
+            self._insert_failures.pop(id(instance), None)
+            self.dropped += 1
+            logger.error(f"Dropping queued {type(instance).__name__} insert after {self.max_retries} retries: {error}")
+            return
+
+        self._insert_failures[id(instance)] = failures
+        self._inserts.append(instance)
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.depth,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "inserted": self.inserted,
+            "coalesced": self.enqueued - self.written - len(self._pending),
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "dropped": self.dropped,
+            "last_flush_latency": round(self.last_flush_latency, 4),
+            "avg_flush_latency": round(self._total_flush_latency / self.flushes, 4) if self.flushes else 0.0,
+            "max_flush_latency": round(self.max_flush_latency, 4),
+        }
+
+    async def close(self) -> None:
+        # The loop is stopped instead of cancelled so a flush in progress is never cut in half
+        if self._task is not None:
+            self._closing = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+
+        await self.flush()
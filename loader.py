@@ -1,24 +1,80 @@
-import asyncio
-
-from utils import load_config, FileOperations, ProxyManager
+from utils import load_config, FileOperations, ProxyManager, ProxyChecker, AdaptiveSemaphore, MetricsServer, registry
 from core.captcha import *
+from core.api.irys import IrysAPI
+from core.onchain.rpc import RPCPool
+from core.onchain.signer import SigningService
 
 config = load_config()
 file_operations = FileOperations()
 
-semaphore = asyncio.Semaphore(config.application_settings.threads)
-proxy_manager = ProxyManager(check_uniqueness=config.application_settings.check_uniqueness_of_proxies)
+semaphore = AdaptiveSemaphore(
+    max_limit=config.application_settings.threads,
+    min_limit=config.concurrency_settings.min_threads,
+    adaptive=config.concurrency_settings.adaptive,
+    error_threshold=config.concurrency_settings.error_threshold,
+    error_window=config.concurrency_settings.error_window,
+    decrease_factor=config.concurrency_settings.decrease_factor,
+    increase_interval=config.concurrency_settings.increase_interval,
+)
+proxy_manager = ProxyManager(
+    check_uniqueness=config.application_settings.check_uniqueness_of_proxies,
+    quarantine_after_failures=config.proxy_settings.quarantine_after_failures,
+    quarantine_base_time=config.proxy_settings.quarantine_base_time,
+    quarantine_max_time=config.proxy_settings.quarantine_max_time,
+    wait_timeout=config.proxy_settings.wait_timeout or None,
+    max_leases_per_proxy=config.proxy_settings.max_accounts_per_proxy or None,
+)
+rpc_pool = RPCPool(
+    urls=config.web3_settings.irys_rpc_urls or [config.web3_settings.irys_rpc_url],
+    hedge_reads=config.web3_settings.hedge_reads,
+    broadcast_fanout=config.web3_settings.broadcast_fanout,
+)
+proxy_checker = ProxyChecker(
+    cache_path=file_operations.base_path / "proxy_checks.json",
+    concurrency=config.proxy_settings.preflight_concurrency,
+    timeout=config.proxy_settings.preflight_timeout,
+    cache_ttl=config.proxy_settings.preflight_cache_ttl,
+    dead_cache_ttl=config.proxy_settings.preflight_dead_cache_ttl,
+    drop_duplicate_exit_ips=config.proxy_settings.drop_duplicate_exit_ips,
+)
+signing_service = SigningService(
+    mode=config.web3_settings.signing_pool.mode,
+    workers=config.web3_settings.signing_pool.workers,
+    max_batch_size=config.web3_settings.signing_pool.max_batch_size,
+)
+metrics_server = MetricsServer(
+    registry=registry,
+    host=config.metrics_settings.host,
+    port=config.metrics_settings.port,
+)
+
+captcha_solver_classes = {
+    "solvium": (SolviumCaptchaSolver, config.captcha_settings.solvium_captcha_api_key),
+    "2captcha": (TwoCaptchaSolver, config.captcha_settings.two_captcha_api_key),
+    "anti_captcha": (AntiCaptchaSolver, config.captcha_settings.anti_captcha_api_key),
+    "capsolver": (CapsolverSolver, config.captcha_settings.capsolver_api_key),
+    "capmonster": (CapmonsterSolver, config.captcha_settings.capmonster_api_key),
+}
+captcha_solvers = {}
+for name in config.captcha_settings.captcha_solvers or [config.captcha_settings.captcha_solver]:
+    if name in captcha_solver_classes:
+        solver_class, api_key = captcha_solver_classes[name]
+        captcha_solvers[name] = solver_class(
+            api_key=api_key,
+            max_attempts=config.captcha_settings.max_captcha_solving_time // 3
+        )
+
+captcha_solver = CaptchaRouter(
+    solvers=captcha_solvers,
+    hedge=config.captcha_settings.hedge_captcha,
+    default_hedge_delay=config.captcha_settings.max_captcha_solving_time / 3,
+) if len(captcha_solvers) > 1 else next(iter(captcha_solvers.values()), None)
 
-captcha_solver = SolviumCaptchaSolver(
-    api_key=config.captcha_settings.solvium_captcha_api_key,
-    max_attempts=config.captcha_settings.max_captcha_solving_time // 3
-) if config.captcha_settings.captcha_solver == "solvium" else TwoCaptchaSolver(
-    api_key=config.captcha_settings.two_captcha_api_key,
-    max_attempts=config.captcha_settings.max_captcha_solving_time // 3
-) if config.captcha_settings.captcha_solver == "2captcha" else AntiCaptchaSolver(
-    api_key=config.captcha_settings.anti_captcha_api_key,
-    max_attempts=config.captcha_settings.max_captcha_solving_time // 3
-) if config.captcha_settings.captcha_solver == "anti_captcha" else CapsolverSolver(
-    api_key=config.captcha_settings.capsolver_api_key,
-    max_attempts=config.captcha_settings.max_captcha_solving_time // 3
-) if config.captcha_settings.captcha_solver == "capsolver" else None
+captcha_pool = CaptchaTokenPool(
+    solver=captcha_solver,
+    site_key=IrysAPI.FAUCET_SITE_KEY,
+    page_url=IrysAPI.FAUCET_PAGE_URL,
+    pool_size=config.captcha_settings.prefetch_pool_size,
+    max_in_flight=config.captcha_settings.prefetch_max_in_flight,
+    token_ttl=config.captcha_settings.prefetch_token_ttl,
+) if captcha_solver is not None and config.captcha_settings.prefetch_tokens else None
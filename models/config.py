@@ -1,7 +1,8 @@
 from dataclasses import dataclass
-from pydantic import BaseModel, PositiveInt, ConfigDict, Field, PositiveFloat
+from typing import Literal
 
-from core.onchain.wallet import Web3Wallet
+from eth_account import Account as EthAccount
+from pydantic import BaseModel, PositiveInt, ConfigDict, Field, PositiveFloat
 
 
 class BaseConfig(BaseModel):
@@ -15,7 +16,7 @@ class Account(BaseConfig):
 
     def model_post_init(self, __context):
         if not self.wallet_address:
-            self.wallet_address = Web3Wallet(self.private_key).wallet_address
+            self.wallet_address = EthAccount.from_key(self.private_key).address
 
 
 
@@ -63,6 +64,94 @@ class ApplicationSettings:
     disable_auto_proxy_change: bool
 
 
+@dataclass
+class ConcurrencySettings:
+    adaptive: bool = True
+    min_threads: PositiveInt = 1
+    error_threshold: PositiveInt = 10
+    error_window: PositiveFloat = 60.0
+    decrease_factor: float = 0.5
+    increase_interval: PositiveFloat = 10.0
+
+
+@dataclass
+class LoggingSettings:
+    level: Literal["TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR"] = "DEBUG"
+    background_writer: bool = True
+    sample_repeated: bool = True
+    sample_window: PositiveFloat = 10.0
+    sample_burst: PositiveInt = 20
+    module_levels: dict[str, str] = Field(default_factory=dict)
+    levels_file: str = "./config/log_levels.yaml"
+
+
+@dataclass
+class DashboardSettings:
+    enabled: bool = True
+    refresh_interval: PositiveFloat = 1.0
+    summary_interval: PositiveFloat = 30.0
+    throughput_window: PositiveFloat = 60.0
+    top_errors: PositiveInt = 5
+
+
+@dataclass
+class MetricsSettings:
+    enabled: bool = False
+    host: str = "127.0.0.1"
+    port: PositiveInt = 9108
+    dump_file: str = "./results/metrics.prom"
+
+
+@dataclass
+class ProfilingSettings:
+    cpu_profile: bool = False
+    profile_clock: Literal["wall", "cpu"] = "wall"
+    memory_snapshots: bool = False
+    memory_interval: PositiveFloat = 60.0
+    loop_lag_monitor: bool = False
+    lag_interval: PositiveFloat = 0.5
+    lag_threshold: PositiveFloat = 0.1
+    loop_debug: bool = False
+    slow_callback_duration: PositiveFloat = 0.1
+    output_dir: str = "./results/profiles"
+
+
+@dataclass
+class TracingSettings:
+    enabled: bool = False
+    sample_rate: PositiveFloat = 0.1
+    max_events: PositiveInt = 500_000
+    output_file: str = "./results/trace.json"
+
+
+@dataclass
+class ResultsSettings:
+    records: bool = True
+    rollup: Literal["none", "csv"] = "none"
+
+
+@dataclass
+class DatabaseSettings:
+    write_behind: bool = True
+    flush_interval: PositiveFloat = 1.0
+    max_pending_writes: PositiveInt = 500
+
+
+@dataclass
+class ProxySettings:
+    quarantine_after_failures: PositiveInt = 2
+    quarantine_base_time: PositiveInt = 30
+    quarantine_max_time: PositiveInt = 600
+    wait_timeout: int = 0
+    max_accounts_per_proxy: int = 0
+    proxy_affinity: bool = True
+    preflight_check: bool = False
+    preflight_concurrency: PositiveInt = 50
+    preflight_timeout: PositiveInt = 15
+    preflight_cache_ttl: PositiveInt = 3600
+    preflight_dead_cache_ttl: PositiveInt = 300
+    drop_duplicate_exit_ips: bool = True
+
 
 @dataclass
 class CaptchaSettings:
@@ -71,19 +160,39 @@ class CaptchaSettings:
     two_captcha_api_key: str = ""
     anti_captcha_api_key: str = ""
     capsolver_api_key: str = ""
+    capmonster_api_key: str = ""
+    captcha_solvers: list[str] = Field(default_factory=list)
+    hedge_captcha: bool = True
     max_captcha_solving_time: PositiveInt = 60
+    prefetch_tokens: bool = False
+    prefetch_pool_size: PositiveInt = 3
+    prefetch_max_in_flight: PositiveInt = 10
+    prefetch_token_ttl: PositiveFloat = 100.0
 
 
 @dataclass
 class GamesSettings:
     top_up_amount: PositiveFloatRange
     games_to_play: list[str] = Field(default_factory=list)
+    overlap_sessions: bool = False
+    max_open_sessions: PositiveInt = 3
+
+
+@dataclass
+class SigningPoolSettings:
+    mode: Literal["inline", "thread", "process"] = "process"
+    workers: PositiveInt = 2
+    max_batch_size: PositiveInt = 32
 
 
 @dataclass
 class Web3Settings:
     irys_rpc_url: str
     verify_balance: bool
+    irys_rpc_urls: list[str] = Field(default_factory=list)
+    hedge_reads: bool = False
+    broadcast_fanout: PositiveInt = 2
+    signing_pool: SigningPoolSettings = Field(default_factory=SigningPoolSettings)
 
 
 @dataclass
@@ -105,5 +214,15 @@ class Config(BaseConfig):
     games_settings: GamesSettings
     web3_settings: Web3Settings
     all_in_one_settings: AllInOneSettings
+    concurrency_settings: ConcurrencySettings = Field(default_factory=ConcurrencySettings)
+    proxy_settings: ProxySettings = Field(default_factory=ProxySettings)
+    database_settings: DatabaseSettings = Field(default_factory=DatabaseSettings)
+    results_settings: ResultsSettings = Field(default_factory=ResultsSettings)
+    logging_settings: LoggingSettings = Field(default_factory=LoggingSettings)
+    dashboard_settings: DashboardSettings = Field(default_factory=DashboardSettings)
+    metrics_settings: MetricsSettings = Field(default_factory=MetricsSettings)
+    tracing_settings: TracingSettings = Field(default_factory=TracingSettings)
+    profiling_settings: ProfilingSettings = Field(default_factory=ProfilingSettings)
 
     module: str = ""
+    headless: bool = False
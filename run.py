@@ -1,3 +1,4 @@
+import argparse
 import asyncio
 import multiprocessing
 import signal
@@ -8,6 +9,7 @@ from multiprocessing import freeze_support
 from loguru import logger
 
 from application import ApplicationManager
+from console import Console
 from loader import config
 from utils import setup_logs
 
@@ -25,10 +27,41 @@ async def main():
         logger.info("Main task was cancelled")
     except Exception as e:
         logger.error(f"An error occurred: {e}")
+    finally:
+        await app.shutdown()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Irys Testnet Bot")
+    parser.add_argument(
+        "--module",
+        choices=[module for module in Console.MODULES_DATA.values() if module != "exit"],
+        help="Run the module once without the interactive menu",
+    )
+    parser.add_argument("--profile", action="store_true", help="Save a CPU profile of every module run")
+    parser.add_argument("--trace-memory", action="store_true", help="Save tracemalloc snapshots periodically")
+    parser.add_argument("--loop-lag", action="store_true", help="Monitor event loop lag")
+    parser.add_argument("--loop-debug", action="store_true", help="Enable asyncio debug mode and log slow callbacks")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
     freeze_support()
+    args = parse_args()
+    if args.module:
+        config.module = args.module
+        config.headless = True
+
+    # Flags only switch profiling on, settings.yaml can enable it for every run
+    if args.profile:
+        config.profiling_settings.cpu_profile = True
+    if args.trace_memory:
+        config.profiling_settings.memory_snapshots = True
+    if args.loop_lag:
+        config.profiling_settings.loop_lag_monitor = True
+    if args.loop_debug:
+        config.profiling_settings.loop_debug = True
+
     if sys.platform == 'win32':
         asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
@@ -36,9 +69,13 @@ if __name__ == "__main__":
     signal.signal(signal.SIGTERM, lambda s, f: asyncio.get_event_loop().stop())
 
     try:
-        setup_logs(is_main=True)
+        setup_logs(is_main=True, logging_settings=config.logging_settings)
         asyncio.run(main())
     except Exception as error:
         logger.error(f"An error occurred: {error}")
 
-    input("\nPress Enter to exit...")
+    # Stops the background log writer after the queued lines are printed
+    logger.remove()
+
+    if not config.headless:
+        input("\nPress Enter to exit...")
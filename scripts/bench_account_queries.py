@@ -0,0 +1,62 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tortoise import Tortoise
+
+# Importing the database package loads config/settings.yaml, run it from a configured checkout
+from database import Accounts, AccountQueries
+
+
+# Raw SQL AccountQueries against the Tortoise ORM calls it replaces, sequential calls on a fresh database.
+# Usage: python scripts/bench_account_queries.py --accounts 5000 --db-url sqlite://:memory:
+
+
+async def timed(label: str, calls: int, coroutine_factory, results: dict) -> None:
+    started = time.perf_counter()
+    for index in range(calls):
+        await coroutine_factory(index)
+    results[label] = time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark AccountQueries against the ORM path")
+    parser.add_argument("--accounts", type=int, default=5000)
+    parser.add_argument("--db-url", default="sqlite://:memory:")
+    args = parser.parse_args()
+
+    await Tortoise.init(db_url=args.db_url, modules={"models": ["database.models.accounts"]}, timezone="UTC")
+    await Tortoise.generate_schemas(safe=True)
+
+    orm_wallets = [f"0x{index:040x}" for index in range(args.accounts)]
+    raw_wallets = [f"0x{index + args.accounts:040x}" for index in range(args.accounts)]
+    orm, raw = {}, {}
+
+    try:
+        await timed("create / upsert", args.accounts, lambda i: Accounts.create_account(orm_wallets[i], "key", "http://proxy"), orm)
+        await timed("create / upsert", args.accounts, lambda i: AccountQueries.upsert(raw_wallets[i], "key", "http://proxy"), raw)
+
+        await timed("get by wallet", args.accounts, lambda i: Accounts.get_account(orm_wallets[i]), orm)
+        await timed("get by wallet", args.accounts, lambda i: AccountQueries.get_by_wallet(raw_wallets[i]), raw)
+
+        await timed("get proxy", args.accounts, lambda i: Accounts.get_account_proxy(orm_wallets[i]), orm)
+        await timed("get proxy", args.accounts, lambda i: AccountQueries.get_proxy(raw_wallets[i]), raw)
+
+        orm_accounts = {account.wallet_address: account for account in await Accounts.filter(wallet_address__in=orm_wallets[:500])}
+        await timed("update proxy", min(500, args.accounts), lambda i: orm_accounts[orm_wallets[i]].update_account_proxy("http://other"), orm)
+        await timed("update proxy", min(500, args.accounts), lambda i: AccountQueries.update_proxy(raw_wallets[i], "http://other"), raw)
+    finally:
+        await Tortoise.close_connections()
+
+    print(f"{'operation':<16} {'calls':>6} {'orm s':>8} {'raw s':>8} {'speedup':>8}")
+    for label in orm:
+        calls = args.accounts if label != "update proxy" else min(500, args.accounts)
+        print(f"{label:<16} {calls:>6} {orm[label]:>8.2f} {raw[label]:>8.2f} {orm[label] / raw[label]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
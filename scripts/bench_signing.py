@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eth_account import Account
+
+from core.onchain.signer import SigningService
+
+
+# Throughput and event loop lag of SigningService in each mode at increasing concurrency.
+# Usage: python scripts/bench_signing.py --requests 2000 --concurrency 1 10 50 200
+
+
+async def measure_lag(stop: asyncio.Event, interval: float, lags: list[float]) -> None:
+    # A ticker that should wake every `interval`, anything later is time the loop was blocked
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def run_case(mode: str, workers: int, concurrency: int, requests: int, keys: list[str]) -> dict:
+    service = SigningService(mode=mode, workers=workers)
+
+    # Warm up the pool so process start-up is not counted
+    await asyncio.gather(*(service.sign_message(keys[0], "warm up") for _ in range(workers)))
+
+    stop, lags = asyncio.Event(), []
+    ticker = asyncio.create_task(measure_lag(stop, 0.005, lags))
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        for index in counter:
+            await service.sign_message(keys[index % len(keys)], f"Timestamp: {index}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await ticker
+    await service.shutdown()
+
+    lags.sort()
+    return {
+        "throughput": requests / elapsed,
+        "lag_p99": lags[min(len(lags) - 1, int(0.99 * len(lags)))] * 1000 if lags else 0.0,
+        "lag_max": lags[-1] * 1000 if lags else 0.0,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark inline and offloaded signing")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--modes", nargs="+", default=["inline", "thread", "process"], choices=["inline", "thread", "process"])
+    args = parser.parse_args()
+
+    keys = [Account.create().key.hex() for _ in range(50)]
+
+    print(f"{'mode':<8} {'concurrency':>11} {'signs/s':>10} {'lag p99 ms':>11} {'lag max ms':>11}")
+    for mode in args.modes:
+        for concurrency in args.concurrency:
+            result = await run_case(mode, args.workers, concurrency, args.requests, keys)
+            print(
+                f"{mode:<8} {concurrency:>11} {result['throughput']:>10.0f} "
+                f"{result['lag_p99']:>11.1f} {result['lag_max']:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,3 +2,4 @@ from .base import *
 from .communication import *
 from .managers import *
 from .processing import *
+from .monitoring import *
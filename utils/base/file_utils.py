@@ -1,22 +1,35 @@
 import asyncio
+import csv
+import json
 import time
-import aiofiles
 
 from pathlib import Path
+from typing import Literal, Optional, TextIO
 from aiocsv import AsyncWriter
 from loguru import logger
 
-from openpyxl import Workbook, load_workbook
-from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
 
 from models import ModuleType, OperationResult, Account
 
 
 class FileOperations:
-    def __init__(self, base_path: str = "./results"):
+    _STOP = object()
+
+    def __init__(self, base_path: str = "./results", flush_interval: float = 1.0, export_batch_size: int = 500):
         self.base_path = Path(base_path)
         self.lock = asyncio.Lock()
+        self.flush_interval = flush_interval
+        self.export_batch_size = export_batch_size
+        self.stats_format = "xlsx"
+
+        # Results go through one writer task, producers only put them on the queue
+        self._export_queue: Optional[asyncio.Queue] = None
+        self._exporter: Optional[asyncio.Task] = None
+        self._handles: dict[Path, TextIO] = {}
+        # Module -> size of its records file before this run's first record, the rollup starts there
+        self._written_records: dict[ModuleType, int] = {}
         self.module_paths: dict[ModuleType, dict[str, Path]] = {
             # "stats": {
             #     "base": self.base_path / "stats" / "accounts_stats.xlsx",
@@ -24,22 +37,27 @@ class FileOperations:
             "request_tokens": {
                 "success": self.base_path / "request_tokens" / "request_tokens_success.txt",
                 "failed": self.base_path / "request_tokens" / "request_tokens_failed.txt",
+                "records": self.base_path / "request_tokens" / "request_tokens_records.jsonl",
             },
             "top_up_game_balance": {
                 "success": self.base_path / "top_up_game_balance" / "top_up_game_balance_success.txt",
                 "failed": self.base_path / "top_up_game_balance" / "top_up_game_balance_failed.txt",
+                "records": self.base_path / "top_up_game_balance" / "top_up_game_balance_records.jsonl",
             },
             "play_games": {
                 "success": self.base_path / "play_games" / "play_games_success.txt",
                 "failed": self.base_path / "play_games" / "play_games_failed.txt",
+                "records": self.base_path / "play_games" / "play_games_records.jsonl",
             },
             "mint_nft": {
                 "success": self.base_path / "mint_nft" / "mint_nft_success.txt",
                 "failed": self.base_path / "mint_nft" / "mint_nft_failed.txt",
+                "records": self.base_path / "mint_nft" / "mint_nft_records.jsonl",
             },
             "all_in_one": {
                 "success": self.base_path / "all_in_one" / "all_in_one_success.txt",
                 "failed": self.base_path / "all_in_one" / "all_in_one_failed.txt",
+                "records": self.base_path / "all_in_one" / "all_in_one_records.jsonl",
             }
         }
 
@@ -53,92 +71,232 @@ class FileOperations:
                 else:
                     path.touch(exist_ok=True)
 
-    async def setup_stats(self):
+    STATS_HEADER = [
+        "Wallet Address",
+        "Private Key",
+        "Daily Points",
+        "Total Points",
+        "Invite Code",
+        "Is Twitter Connected",
+        "Twitter Username",
+    ]
+    STATS_COLUMN_WIDTHS = [46, 66, 14, 14, 14, 20, 24]
+
+    RECORD_COLUMNS = [
+        "run_id", "wallet_address", "module", "account_status", "task", "status", "error_class",
+        "attempts", "proxy", "tx_hashes", "captcha_time", "rpc_time", "api_time", "confirmation_time", "duration",
+    ]
+
+    async def setup_stats(self, file_format: Literal["xlsx", "csv"] = "xlsx"):
         self.base_path.mkdir(exist_ok=True)
 
-        for module_name, module_paths in self.module_paths.items():
-            if module_name == "stats":
-                timestamp = int(time.time())
-                for path_key, path in module_paths.items():
-                    path.parent.mkdir(parents=True, exist_ok=True)
-                    if path_key == "base":
-                        new_path = path.parent / f"accounts_stats_{timestamp}.xlsx"
-                        self.module_paths[module_name][path_key] = new_path
-                        await asyncio.to_thread(self._create_excel_with_header, new_path)
+        # Rows are spooled as JSON lines through the exporter and converted once when the run ends,
+        # JSON keeps the cell types that a CSV spool would turn into strings
+        timestamp = int(time.time())
+        stats_dir = self.base_path / "stats"
+        stats_dir.mkdir(parents=True, exist_ok=True)
 
-    @staticmethod
-    def _create_excel_with_header(xlsx_path: Path, sheet_name: str = "Stats"):
-        wb = Workbook()
-        ws: Worksheet = wb.active
-        ws.title = sheet_name
-        ws.append([
-            "Wallet Address",
-            "Private Key",
-            "Daily Points",
-            "Total Points",
-            "Invite Code",
-            "Is Twitter Connected",
-            "Twitter Username",
-        ])
-
-        widths = [46, 66, 14, 14, 14, 20, 24]
-        for i, w in enumerate(widths, start=1):
+        self.stats_format = file_format
+        self.module_paths["stats"] = {
+            "base": stats_dir / f"accounts_stats_{timestamp}.{file_format}",
+            "spool": stats_dir / f".accounts_stats_{timestamp}.spool.jsonl",
+        }
+        self._export_json(self.module_paths["stats"]["spool"], self.STATS_HEADER)
+
+    async def finalize_stats(self):
+        stats_paths = self.module_paths.get("stats")
+        if not stats_paths:
+            return
+
+        # Drains the exporter so every queued row is on disk
+        await self.close()
+
+        try:
+            if self.stats_format == "csv":
+                await asyncio.to_thread(self._write_stats_csv, stats_paths["spool"], stats_paths["base"])
+            else:
+                await asyncio.to_thread(self._write_stats_workbook, stats_paths["spool"], stats_paths["base"])
+            stats_paths["spool"].unlink(missing_ok=True)
+
+            logger.success(f"Stats exported to {stats_paths['base']}")
+        except Exception as e:
+            logger.error(f"Error while exporting stats to {stats_paths['base']}: {e}")
+
+    def _write_stats_workbook(self, spool_path: Path, xlsx_path: Path, sheet_name: str = "Stats"):
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(sheet_name)
+
+        for i, w in enumerate(self.STATS_COLUMN_WIDTHS, start=1):
             ws.column_dimensions[get_column_letter(i)].width = w
-        wb.save(xlsx_path)
 
-    async def _append_excel_row(self, xlsx_path: Path, row: list, sheet_name: str = "Stats"):
-        await asyncio.to_thread(self._append_excel_row_sync, xlsx_path, row, sheet_name)
+        with open(spool_path, encoding="utf-8") as spool:
+            for line in spool:
+                ws.append(json.loads(line))
 
-    @staticmethod
-    def _append_excel_row_sync(xlsx_path: Path, row: list, sheet_name: str = "Stats"):
-        wb = load_workbook(xlsx_path)
-        ws: Worksheet = wb[sheet_name] if sheet_name in wb.sheetnames else wb.active
-        ws.append(row)
         wb.save(xlsx_path)
-        wb.close()
+
+    @staticmethod
+    def _write_stats_csv(spool_path: Path, csv_path: Path):
+        with open(spool_path, encoding="utf-8") as spool, open(csv_path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            for line in spool:
+                writer.writerow(json.loads(line))
+
+    def _export_json(self, file_path: Path, value: list | dict) -> None:
+        self._ensure_exporter()
+        self._export_queue.put_nowait((file_path, json.dumps(value, default=str) + "\n"))
+
+    async def export_record(self, record: dict, module: ModuleType):
+        if module not in self.module_paths:
+            raise ValueError(f"Unknown module: {module}")
+
+        records_path = self.module_paths[module]["records"]
+        if module not in self._written_records:
+            self._written_records[module] = records_path.stat().st_size if records_path.exists() else 0
+        self._export_json(records_path, record)
+
+    async def rollup_records(self):
+        modules, self._written_records = self._written_records, {}
+        if not modules:
+            return
+
+        # Drains the exporter so every queued record is on disk
+        await self.close()
+
+        for module, offset in modules.items():
+            records_path = self.module_paths[module]["records"]
+            try:
+                await asyncio.to_thread(self._write_records_csv, records_path, records_path.with_suffix(".csv"), offset)
+            except Exception as e:
+                logger.error(f"Error while writing records rollup for {module}: {e}")
+
+    def _write_records_csv(self, records_path: Path, csv_path: Path, offset: int = 0):
+        # Only this run's records are appended, earlier runs are already in the CSV.
+        # Without a CSV yet the whole history is converted once
+        new_file = not csv_path.exists() or csv_path.stat().st_size == 0
+        if new_file:
+            offset = 0
+
+        with open(records_path, encoding="utf-8") as records, open(csv_path, "a", newline="", encoding="utf-8") as file:
+            records.seek(offset)
+            writer = csv.writer(file)
+            if new_file:
+                writer.writerow(self.RECORD_COLUMNS)
+
+            for line in records:
+                record = json.loads(line)
+                for task in record["tasks"]:
+                    writer.writerow([
+                        record["run_id"],
+                        record["wallet_address"],
+                        record["module"],
+                        record["status"],
+                        task["task"],
+                        task["status"],
+                        task["error_class"],
+                        task["attempts"],
+                        task["proxy"],
+                        "|".join(task["tx_hashes"]),
+                        task["stages"]["captcha"],
+                        task["stages"]["rpc"],
+                        task["stages"]["api"],
+                        task["stages"]["confirmation"],
+                        task["duration"],
+                    ])
 
     async def export_result(self, result: OperationResult, module: ModuleType):
         if module not in self.module_paths:
             raise ValueError(f"Unknown module: {module}")
 
         file_path = self.module_paths[module]["success" if result["status"] else "failed"]
-        async with self.lock:
+        self._ensure_exporter()
+        self._export_queue.put_nowait((file_path, f"{result['pk_or_mnemonic']}\n"))
+
+    def _ensure_exporter(self) -> None:
+        if self._exporter is not None and not self._exporter.done():
+            return
+
+        if self._export_queue is None:
+            self._export_queue = asyncio.Queue()
+        self._exporter = asyncio.create_task(self._run_exporter())
+
+    async def _run_exporter(self) -> None:
+        last_flush = time.monotonic()
+
+        while True:
             try:
-                async with aiofiles.open(file_path, "a") as file:
-                    await file.write(f"{result['pk_or_mnemonic']}\n")
-            except IOError as e:
-                logger.error(f"Account: {result['pk_or_mnemonic']} | Error writing to file (IOError): {e}")
-            except Exception as e:
-                logger.error(f"Account: {result['pk_or_mnemonic']} | Error writing to file: {e}")
+                batch = [await asyncio.wait_for(self._export_queue.get(), timeout=self.flush_interval)]
+            except asyncio.TimeoutError:
+                batch = []
+
+            while len(batch) < self.export_batch_size and not self._export_queue.empty():
+                batch.append(self._export_queue.get_nowait())
+
+            stopping = any(item is self._STOP for item in batch)
+            lines = [item for item in batch if item is not self._STOP]
+            flush = stopping or time.monotonic() - last_flush >= self.flush_interval
+
+            if lines or (flush and self._handles):
+                try:
+                    # One thread hop per batch instead of one per line
+                    await asyncio.to_thread(self._write_lines, lines, flush)
+                except Exception as e:
+                    logger.error(f"Error writing {len(lines)} results to files: {e}")
+
+            if flush:
+                last_flush = time.monotonic()
+            if stopping:
+                return
+
+    def _write_lines(self, lines: list[tuple[Path, str]], flush: bool) -> None:
+        for file_path, line in lines:
+            handle = self._handles.get(file_path)
+            if handle is None:
+                handle = self._handles[file_path] = open(file_path, "a", encoding="utf-8", buffering=64 * 1024)
+            handle.write(line)
+
+        if flush:
+            for handle in self._handles.values():
+                handle.flush()
+
+    def _close_handles(self) -> None:
+        for handle in self._handles.values():
+            handle.close()
+        self._handles.clear()
+
+    async def close(self) -> None:
+        if self._exporter is not None and not self._exporter.done():
+            self._export_queue.put_nowait(self._STOP)
+            await self._exporter
+
+        self._exporter = None
+        await asyncio.to_thread(self._close_handles)
 
     async def export_stats(self, result: OperationResult):
-        file_path = self.module_paths["stats"]["base"]
-        async with self.lock:
-            try:
-                if result["status"] is True:
-                    row = [
-                        result["data"]["wallet_address"],
-                        result["data"]["private_key"],
-                        result["data"]["daily_points"],
-                        result["data"]["total_points"],
-                        result["data"]["invite_code"],
-                        result["data"]["user_info"]["linkTwitter"],
-                        result["data"]["user_info"]["xUsername"],
-                    ]
-                else:
-                    row = [
-                        result["data"]["wallet_address"],
-                        result["data"]["private_key"],
-                        "N/A",
-                        "N/A",
-                        "N/A",
-                        "N/A",
-                        "N/A",
-                    ]
-
-                await self._append_excel_row(file_path, row)
-
-            except IOError as e:
-                logger.error(f"Account: {result['data']['wallet_address']} | Error writing to Excel (IOError): {e}")
-            except Exception as e:
-                logger.error(f"Account: {result['data']['wallet_address']} | Error writing to Excel: {e}")
+        file_path = self.module_paths["stats"]["spool"]
+        try:
+            if result["status"] is True:
+                row = [
+                    result["data"]["wallet_address"],
+                    result["data"]["private_key"],
+                    result["data"]["daily_points"],
+                    result["data"]["total_points"],
+                    result["data"]["invite_code"],
+                    result["data"]["user_info"]["linkTwitter"],
+                    result["data"]["user_info"]["xUsername"],
+                ]
+            else:
+                row = [
+                    result["data"]["wallet_address"],
+                    result["data"]["private_key"],
+                    "N/A",
+                    "N/A",
+                    "N/A",
+                    "N/A",
+                    "N/A",
+                ]
+
+            self._export_json(file_path, row)
+
+        except Exception as e:
+            logger.error(f"Account: {result['data']['wallet_address']} | Error exporting stats: {e}")
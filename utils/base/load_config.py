@@ -68,9 +68,6 @@ class ConfigLoader:
             proxy_lines = self._read_file(
                 self.data_path / "proxies.txt", allow_empty=True
             )
-            for proxy in proxy_lines:
-                Proxy.from_str(proxy)
-
             return [Proxy.from_str(proxy).as_url for proxy in proxy_lines]
         except Exception as e:
             raise ConfigurationError(f"Failed to parse proxies: {e}")
@@ -1,2 +1,3 @@
 from .console import *
 from .logs import *
+from .dashboard import *
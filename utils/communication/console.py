@@ -7,8 +7,17 @@ import urllib3
 
 from loguru import logger
 
+from .log_pipeline import BackgroundStream, LogSampler, ModuleLevelFilter
 
-def setup_multiprocess_logging(is_main: bool = False):
+
+level_filter = ModuleLevelFilter()
+
+
+def set_log_level(module: str, level: str) -> None:
+    level_filter.set_level(module, level)
+
+
+def setup_multiprocess_logging(is_main: bool = False, logging_settings=None):
     log_path = Path("logs")
     log_path.mkdir(exist_ok=True)
     logger.remove()
@@ -19,7 +28,27 @@ def setup_multiprocess_logging(is_main: bool = False):
         "<level>{message}</level>"
     )
 
-    logger.add(sys.stdout, format=log_format, enqueue=True, colorize=True, level="DEBUG")
+    background_writer = logging_settings is not None and logging_settings.background_writer
+
+    if background_writer:
+        level_filter.set_levels(logging_settings.module_levels)
+        sampler = LogSampler(
+            window=logging_settings.sample_window,
+            burst=logging_settings.sample_burst,
+        ) if logging_settings.sample_repeated else None
+
+        stream = BackgroundStream(
+            sampler=sampler,
+            level_filter=level_filter,
+            levels_file=logging_settings.levels_file or None,
+        )
+        sink_filter = level_filter if sampler is None else (
+            # The level filter goes first, so records below the level do not count towards a template
+            lambda record: level_filter(record) and sampler.allow(record)
+        )
+        logger.add(stream, format=log_format, colorize=True, level=logging_settings.level, filter=sink_filter)
+    else:
+        logger.add(sys.stdout, format=log_format, enqueue=True, colorize=True, level="DEBUG")
 
     if is_main:
         log_file = f"logs/main_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log"
@@ -32,13 +61,15 @@ def setup_multiprocess_logging(is_main: bool = False):
         rotation="75 MB",
         retention="3 days",
         compression="zip",
-        enqueue=True,
+        # Each process writes its own file, so records are not pickled through a multiprocessing queue
+        enqueue=not background_writer,
         backtrace=False,
         diagnose=False,
         level="INFO",
+        filter=level_filter,
     )
 
 
-def setup_logs(is_main: bool = False):
+def setup_logs(is_main: bool = False, logging_settings=None):
     urllib3.disable_warnings()
-    setup_multiprocess_logging(is_main)
+    setup_multiprocess_logging(is_main, logging_settings)
@@ -0,0 +1,134 @@
+import asyncio
+
+from typing import Optional
+
+from loguru import logger
+from rich import box
+from rich.console import Console as RichConsole, Group
+from rich.live import Live
+from rich.table import Table
+from rich.text import Text
+
+from utils.monitoring.metrics import accounts_active, accounts_parked, semaphore_in_use
+from utils.processing.progress import Progress
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "--"
+
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m" if hours else f"{minutes}m {seconds:02d}s"
+
+
+class LiveDashboard:
+    # The loop only builds the renderables at refresh_interval, rich draws them from its own
+    # refresh thread. Headless runs get a one line summary every summary_interval instead
+    MIN_REFRESH_INTERVAL = 0.25
+
+    def __init__(
+        self,
+        progress: Progress,
+        title: str,
+        interactive: bool = True,
+        refresh_interval: float = 1.0,
+        summary_interval: float = 30.0,
+        top_errors: int = 5,
+    ):
+        self.progress = progress
+        self.title = title
+        self.interactive = interactive
+        self.refresh_interval = max(refresh_interval, self.MIN_REFRESH_INTERVAL)
+        self.summary_interval = summary_interval
+        self.top_errors = top_errors
+
+        self._live: Optional[Live] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def counts(self) -> dict[str, int]:
+        taken = int(semaphore_in_use.get())
+        return {
+            "in_flight": int(accounts_active.get()),
+            "parked": int(accounts_parked.get()),
+            "queued": max(self.progress.total - self.progress.processed - taken, 0),
+        }
+
+    def summary(self) -> str:
+        progress = self.progress
+        counts = self.counts()
+        percent = progress.processed / progress.total * 100 if progress.total else 100
+
+        line = (
+            f"{self.title} | {progress.processed}/{progress.total} ({percent:.0f}%) | "
+            f"{progress.throughput():.1f} acc/min | ETA {format_duration(progress.eta())} | "
+            f"Success: {progress.succeeded} | Failed: {progress.failed} | "
+            f"In flight: {counts['in_flight']} | Parked: {counts['parked']} | Queued: {counts['queued']}"
+        )
+
+        errors = progress.top_errors(self.top_errors)
+        if errors:
+            line += " | Top errors: " + ", ".join(f"{name} x{count}" for name, count in errors)
+        return line
+
+    def render(self) -> Group:
+        progress = self.progress
+        counts = self.counts()
+
+        header = Text.assemble(
+            (f"{self.title}  ", "bold cyan"),
+            (f"{progress.processed}/{progress.total}", "bold"),
+            f"  {progress.throughput():.1f} acc/min  ETA {format_duration(progress.eta())}  ",
+            (f"✔ {progress.succeeded}", "green"), "  ", (f"✘ {progress.failed}", "red"),
+            f"  in flight {counts['in_flight']}  parked {counts['parked']}  queued {counts['queued']}",
+        )
+
+        tasks = Table(box=box.SIMPLE, expand=False)
+        tasks.add_column("Task", style="cyan")
+        tasks.add_column("Success", style="green", justify="right")
+        tasks.add_column("Failed", style="red", justify="right")
+        for task, (succeeded, failed) in sorted(progress.tasks.items()):
+            tasks.add_row(task, str(succeeded), str(failed))
+
+        errors = Table(box=box.SIMPLE, expand=False)
+        errors.add_column("Error", style="yellow")
+        errors.add_column("Count", justify="right")
+        for name, count in progress.top_errors(self.top_errors):
+            errors.add_row(name, str(count))
+
+        return Group(header, tasks, errors)
+
+    async def start(self) -> None:
+        if self.interactive:
+            self._live = Live(
+                self.render(),
+                console=RichConsole(),
+                refresh_per_second=1 / self.refresh_interval,
+                redirect_stdout=True,
+                redirect_stderr=False,
+            )
+            self._live.start()
+
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            if self._live is not None:
+                await asyncio.sleep(self.refresh_interval)
+                self._live.update(self.render())
+            else:
+                await asyncio.sleep(self.summary_interval)
+                logger.info(self.summary())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        if self._live is not None:
+            self._live.update(self.render(), refresh=True)
+            self._live.stop()
+            self._live = None
+
+        logger.info(self.summary())
@@ -0,0 +1,169 @@
+import queue
+import re
+import sys
+import threading
+import time
+
+from pathlib import Path
+from typing import Optional, TextIO
+
+import yaml
+
+from loguru import logger
+
+
+class ModuleLevelFilter:
+    # Minimum level per module prefix, e.g. {"core.api": "WARNING"}, the longest matching prefix wins
+    def __init__(self, default_level: str = "DEBUG", module_levels: dict[str, str] = None):
+        self.default_level = default_level
+        self._levels: dict[str, int] = {}
+        self._resolved: dict[str, int] = {}
+        self.set_levels(module_levels or {})
+
+    def set_levels(self, module_levels: dict[str, str]) -> None:
+        self._levels = {module: logger.level(level.upper()).no for module, level in module_levels.items()}
+        self._resolved = {}
+
+    def set_level(self, module: str, level: str) -> None:
+        self._levels[module] = logger.level(level.upper()).no
+        self._resolved = {}
+
+    def _resolve(self, name: str) -> int:
+        module = name
+        while module:
+            if module in self._levels:
+                return self._levels[module]
+            module = module.rpartition(".")[0]
+
+        return logger.level(self.default_level).no
+
+    def __call__(self, record: dict) -> bool:
+        name = record["name"] or ""
+        level = self._resolved.get(name)
+        if level is None:
+            level = self._resolved[name] = self._resolve(name)
+
+        return record["level"].no >= level
+
+
+class LogSampler:
+    # Messages that only differ in wallets, hashes or numbers share a template,
+    # the first `burst` of a template per window are kept and the rest are counted.
+    # Used as a sink filter, so dropped records are never formatted on the event loop
+    _VARIABLE_PARTS = re.compile(r"0x[0-9a-fA-F]+|\d+(?:\.\d+)?")
+
+    def __init__(self, window: float = 10.0, burst: int = 5):
+        self.window = window
+        self.burst = burst
+        self._counts: dict[str, int] = {}
+        self._window_started = time.monotonic()
+        self._min_kept_level = logger.level("SUCCESS").no
+        # allow() runs on the logging threads, roll() on the writer thread
+        self._lock = threading.Lock()
+
+    def template(self, message: str) -> str:
+        return self._VARIABLE_PARTS.sub("#", message)
+
+    def allow(self, record: dict) -> bool:
+        # Account outcomes (SUCCESS), warnings and errors are never dropped
+        if record["level"].no >= self._min_kept_level:
+            return True
+
+        key = self.template(record["message"])
+        with self._lock:
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+        return count <= self.burst
+
+    def roll(self, force: bool = False) -> list[tuple[str, int]]:
+        if not force and time.monotonic() - self._window_started < self.window:
+            return []
+
+        with self._lock:
+            counts, self._counts = self._counts, {}
+            self._window_started = time.monotonic()
+
+        return [(key, count - self.burst) for key, count in counts.items() if count > self.burst]
+
+
+class BackgroundStream:
+    # Terminal writes happen on a dedicated thread, the event loop only formats the line and queues it
+    def __init__(
+        self,
+        stream: TextIO = None,
+        sampler: LogSampler = None,
+        level_filter: ModuleLevelFilter = None,
+        levels_file: Optional[str] = None,
+        levels_check_interval: float = 2.0,
+    ):
+        self._stream = stream
+        self.sampler = sampler
+        self.level_filter = level_filter
+        self.levels_file = Path(levels_file) if levels_file else None
+        self.levels_check_interval = levels_check_interval
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._levels_mtime: Optional[float] = None
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def stream(self) -> TextIO:
+        # Resolved on every write, so a live display redirecting stdout keeps the logs above it
+        return self._stream or sys.stdout
+
+    def write(self, message) -> None:
+        self._queue.put(message)
+
+    def _run(self) -> None:
+        next_levels_check = 0.0
+
+        while True:
+            try:
+                message = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                message = None
+
+            if message is StopIteration:
+                self._write_suppressed(force=True)
+                self.stream.flush()
+                return
+
+            if message is not None:
+                self.stream.write(message)
+
+            self._write_suppressed()
+            if self._queue.empty():
+                self.stream.flush()
+
+            if self.levels_file and time.monotonic() >= next_levels_check:
+                next_levels_check = time.monotonic() + self.levels_check_interval
+                self._reload_levels()
+
+    def _write_suppressed(self, force: bool = False) -> None:
+        if self.sampler is None:
+            return
+
+        for template, count in self.sampler.roll(force):
+            self.stream.write(f"... {count} more similar messages suppressed: {template}\n")
+
+    def _reload_levels(self) -> None:
+        # Levels can be switched while the bot runs by editing the levels file
+        try:
+            mtime = self.levels_file.stat().st_mtime
+        except OSError:
+            return
+
+        if mtime == self._levels_mtime or self.level_filter is None:
+            return
+
+        self._levels_mtime = mtime
+        try:
+            module_levels = yaml.safe_load(self.levels_file.read_text(encoding="utf-8")) or {}
+            self.level_filter.set_levels({str(module): str(level) for module, level in module_levels.items()})
+        except Exception as error:
+            self.stream.write(f"Unable to reload log levels from {self.levels_file}: {error}\n")
+
+    def stop(self) -> None:
+        self._queue.put(StopIteration)
+        self._thread.join(timeout=5)
@@ -1 +1,3 @@
 from .proxy_manager import ProxyManager
+from .proxy_checker import ProxyChecker, ProxyVerdict
+from .concurrency import AdaptiveSemaphore
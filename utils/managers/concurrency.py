@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+from loguru import logger
+
+from core.exceptions.tracker import ErrorTracker
+from utils.monitoring.metrics import registry
+
+
+concurrency_limit = registry.gauge("irys_concurrency_limit", "Account slots currently allowed to run")
+
+
+class AdaptiveSemaphore:
+    # AIMD limit on the account slots: a spike of one error class halves the limit,
+    # every `increase_interval` without a spike gives one slot back, up to `max_limit`.
+    # With adaptive=False it behaves like asyncio.Semaphore(max_limit)
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        adaptive: bool = True,
+        error_threshold: int = 10,
+        error_window: float = 60.0,
+        decrease_factor: float = 0.5,
+        increase_interval: float = 10.0,
+    ):
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        self.adaptive = adaptive
+        self.error_threshold = error_threshold
+        self.decrease_factor = decrease_factor
+        self.increase_interval = increase_interval
+
+        self.tracker = ErrorTracker(max_errors=error_threshold, time_window=int(error_window))
+        self.limit = max_limit
+        self._in_use = 0
+        # The first spike is answered right away, later changes wait for increase_interval
+        self._last_change = float("-inf")
+        self._condition = asyncio.Condition()
+        concurrency_limit.set(self.limit)
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    def locked(self) -> bool:
+        return self._in_use >= self.limit
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            if self._maybe_increase():
+                self._condition.notify(max(self.limit - self._in_use - 1, 0))
+            try:
+                await self._condition.wait_for(lambda: self._in_use < self.limit)
+            except asyncio.CancelledError:
+                # This waiter may have been the one woken for a free slot, pass the wake-up on
+                if self._in_use < self.limit:
+                    self._condition.notify(1)
+                raise
+            self._in_use += 1
+
+    async def release(self) -> None:
+        async with self._condition:
+            self._in_use -= 1
+            self._maybe_increase()
+            # Waking only as many waiters as there are free slots keeps a release O(1) with thousands waiting
+            self._condition.notify(max(self.limit - self._in_use, 0))
+
+    async def __aenter__(self) -> "AdaptiveSemaphore":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.release()
+
+    def record_error(self, error: Exception | str) -> None:
+        error_type = error if isinstance(error, str) else type(error).__name__
+        count = self.tracker.record(error_type)
+        if not self.adaptive or count < self.error_threshold:
+            return
+
+        now = time.monotonic()
+        if now - self._last_change < self.increase_interval or self.limit <= self.min_limit:
+            return
+
+        previous, self.limit = self.limit, max(self.min_limit, int(self.limit * self.decrease_factor))
+        self._last_change = now
+        concurrency_limit.set(self.limit)
+        logger.warning(
+            f"{count} {error_type} errors in {self.tracker.time_window}s | "
+            f"Concurrency lowered {previous} -> {self.limit}"
+        )
+
+    def _maybe_increase(self) -> bool:
+        if not self.adaptive or self.limit >= self.max_limit:
+            return False
+
+        now = time.monotonic()
+        if now - self._last_change < self.increase_interval:
+            return False
+
+        if any(count >= self.error_threshold for count in self.tracker.counts().values()):
+            return False
+
+        self.limit += 1
+        self._last_change = now
+        concurrency_limit.set(self.limit)
+        logger.debug(f"Concurrency raised to {self.limit}")
+        return True
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import ssl
+import time
+
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Optional
+
+from curl_cffi.requests import AsyncSession
+from loguru import logger
+from python_socks.async_.asyncio import Proxy as TunnelProxy
+
+
+@dataclass
+class ProxyVerdict:
+    proxy: str
+    alive: bool
+    checked_at: float
+    exit_ip: Optional[str] = None
+    connect_time: Optional[float] = None
+    tls_time: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def handshake_time(self) -> Optional[float]:
+        if self.connect_time is None or self.tls_time is None:
+            return None
+        return self.connect_time + self.tls_time
+
+
+class ProxyChecker:
+    EXIT_IP_URL = "https://api.ipify.org?format=json"
+
+    def __init__(
+        self,
+        cache_path: Path | str = "./results/proxy_checks.json",
+        target_host: str = "irys.xyz",
+        concurrency: int = 50,
+        timeout: float = 15,
+        cache_ttl: int = 3600,
+        dead_cache_ttl: int = 300,
+        drop_duplicate_exit_ips: bool = True,
+    ):
+        self.cache_path = Path(cache_path)
+        self.target_host = target_host
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.dead_cache_ttl = dead_cache_ttl
+        self.drop_duplicate_exit_ips = drop_duplicate_exit_ips
+
+        self._ssl_context = ssl.create_default_context()
+        self._ssl_context.check_hostname = False
+        self._ssl_context.verify_mode = ssl.CERT_NONE
+
+    def _load_cache(self) -> dict[str, ProxyVerdict]:
+        if not self.cache_path.exists():
+            return {}
+
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            return {proxy: ProxyVerdict(**verdict) for proxy, verdict in data.items()}
+        except Exception as error:
+            logger.warning(f"Proxy check cache is unreadable and will be rebuilt: {error}")
+            return {}
+
+    def _save_cache(self, verdicts: dict[str, ProxyVerdict]) -> None:
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_path.write_text(
+            json.dumps({proxy: asdict(verdict) for proxy, verdict in verdicts.items()}, indent=2),
+            encoding="utf-8",
+        )
+
+    async def _measure_tunnel(self, proxy: str) -> tuple[float, float]:
+        started = time.monotonic()
+        sock = await TunnelProxy.from_url(proxy).connect(
+            dest_host=self.target_host, dest_port=443, timeout=self.timeout
+        )
+        connected = time.monotonic()
+
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(sock=sock, ssl=self._ssl_context, server_hostname=self.target_host),
+            timeout=self.timeout,
+        )
+        handshake_done = time.monotonic()
+
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+
+        return connected - started, handshake_done - connected
+
+    async def _fetch_exit_ip(self, proxy: str) -> str:
+        async with AsyncSession(impersonate="chrome131", verify=False, timeout=self.timeout) as session:
+            response = await session.get(self.EXIT_IP_URL, proxies={"http": proxy, "https": proxy})
+            response.raise_for_status()
+            return response.json()["ip"]
+
+    async def _check_proxy(self, proxy: str, semaphore: asyncio.Semaphore) -> ProxyVerdict:
+        async with semaphore:
+            try:
+                connect_time, tls_time = await self._measure_tunnel(proxy)
+                exit_ip = await self._fetch_exit_ip(proxy)
+
+                return ProxyVerdict(
+                    proxy=proxy,
+                    alive=True,
+                    checked_at=time.time(),
+                    exit_ip=exit_ip,
+                    connect_time=round(connect_time, 4),
+                    tls_time=round(tls_time, 4),
+                )
+
+            except Exception as error:
+                return ProxyVerdict(
+                    proxy=proxy,
+                    alive=False,
+                    checked_at=time.time(),
+                    error=str(error) or type(error).__name__,
+                )
+
+    def _ttl(self, verdict: ProxyVerdict) -> int:
+        # A dead proxy is often only down for a moment, so it is rechecked much sooner than a live one
+        return self.cache_ttl if verdict.alive else self.dead_cache_ttl
+
+    async def check(self, proxies: list[str]) -> dict[str, ProxyVerdict]:
+        cache = self._load_cache()
+        now = time.time()
+
+        unique_proxies = list(dict.fromkeys(proxies))
+        verdicts = {
+            proxy: cache[proxy] for proxy in unique_proxies
+            if proxy in cache and now - cache[proxy].checked_at < self._ttl(cache[proxy])
+        }
+        to_check = [proxy for proxy in unique_proxies if proxy not in verdicts]
+
+        if to_check:
+            logger.info(f"Checking {len(to_check)} proxies ({len(verdicts)} cached)..")
+            semaphore = asyncio.Semaphore(self.concurrency)
+            checked = await asyncio.gather(*(self._check_proxy(proxy, semaphore) for proxy in to_check))
+            verdicts.update({verdict.proxy: verdict for verdict in checked})
+
+            cache.update(verdicts)
+            try:
+                self._save_cache(cache)
+            except Exception as error:
+                logger.warning(f"Unable to save proxy check cache: {error}")
+
+        working, seen_ips, duplicates = {}, set(), 0
+        for proxy in proxies:
+            verdict = verdicts[proxy]
+            if not verdict.alive or proxy in working:
+                continue
+
+            if self.drop_duplicate_exit_ips and verdict.exit_ip:
+                if verdict.exit_ip in seen_ips:
+                    duplicates += 1
+                    continue
+                seen_ips.add(verdict.exit_ip)
+
+            working[proxy] = verdict
+
+        dead = sum(1 for proxy in unique_proxies if not verdicts[proxy].alive)
+        logger.info(
+            f"Proxy check finished | Working: {len(working)} | Dead: {dead} | Duplicate exit IPs: {duplicates}"
+        )
+        return working
@@ -1,58 +1,233 @@
 import asyncio
-import os
-import sys
+import random
+import time
 
-from sys import exit
 from collections import deque
+from typing import Optional
+
 from better_proxy import Proxy
 from loguru import logger
 
+from core.exceptions.base import NoAvailableProxies
+
+
+class ProxyHealth:
+    __slots__ = ("latency", "success_rate", "failures", "quarantined_until")
+
+    def __init__(self):
+        self.latency: Optional[float] = None
+        self.success_rate = 1.0
+        self.failures = 0
+        self.quarantined_until = 0.0
+
+    @property
+    def quarantined(self) -> bool:
+        return time.monotonic() < self.quarantined_until
+
+    @property
+    def score(self) -> float:
+        # Untested proxies have no latency yet and are tried first
+        return self.success_rate / (1 + (self.latency or 0.0))
+
 
 class ProxyManager:
-    def __init__(self, check_uniqueness: bool) -> None:
+    # Selection compares a few random candidates instead of scanning the whole pool,
+    # small pools are still scanned in full
+    SAMPLE_SIZE = 3
+    FULL_SCAN_LIMIT = 16
+
+    def __init__(
+        self,
+        check_uniqueness: bool,
+        alpha: float = 0.3,
+        quarantine_after_failures: int = 2,
+        quarantine_base_time: float = 30,
+        quarantine_max_time: float = 600,
+        wait_timeout: float = None,
+        max_leases_per_proxy: int = None,
+    ) -> None:
         self.check_uniqueness = check_uniqueness
-        self.proxies = deque()
-        self.lock = asyncio.Lock()
-        self.active_proxies = set()
+        # Uniqueness is a cap of one lease per proxy
+        self.max_leases_per_proxy = 1 if check_uniqueness else max_leases_per_proxy
+        self.alpha = alpha
+        self.quarantine_after_failures = quarantine_after_failures
+        self.quarantine_base_time = quarantine_base_time
+        self.quarantine_max_time = quarantine_max_time
+        self.wait_timeout = wait_timeout
+
+        self.health: dict[str, ProxyHealth] = {}
+        self._available: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._leases: dict[str, int] = {}
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def active_proxies(self) -> set[str]:
+        return set(self._leases)
+
+    @property
+    def available_count(self) -> int:
+        return len(self._available)
+
+    @staticmethod
+    def _key(proxy: Proxy | str) -> str:
+        return proxy.as_url if isinstance(proxy, Proxy) else proxy
 
     def load_proxy(self, proxies: list[str]) -> None:
-        self.proxies = deque([Proxy.from_str(proxy) for proxy in proxies])
-
-    async def get_proxy(self) -> Proxy | None:
-        async with self.lock:
-            while True:
-                if self.proxies:
-                    proxy = self.proxies.popleft()
-                    if self.check_uniqueness:
-                        if proxy in self.active_proxies:
-                            continue
-                        else:
-                            self.active_proxies.add(proxy)
-                            return proxy
-                    else:
-                        return proxy
-                else:
-                    logger.error("No available proxies, please add more proxies to the file and restart the application.")
-                    logger.critical("No available proxies, please add more proxies to the file and restart the application.")
-                    await asyncio.sleep(1)
-
-                    while True:
-                        logger.critical(f"No available proxies, please add more proxies to the file and restart the application.")
-                        await asyncio.sleep(5)
+        proxies = list(dict.fromkeys(self._key(proxy) for proxy in proxies))
+
+        self.health = {proxy: self.health.get(proxy) or ProxyHealth() for proxy in proxies}
+        self._available = proxies
+        self._positions = {proxy: index for index, proxy in enumerate(proxies)}
+        self._leases = {}
+
+        # Callers still waiting on the old pool are served from the new one in queue order,
+        # timed out and cancelled waiters are dropped
+        waiters, self._waiters = self._waiters, deque()
+        for waiter in waiters:
+            if waiter.done():
+                continue
+
+            proxy = self._select()
+            if proxy is None:
+                self._waiters.append(waiter)
+            else:
+                waiter.set_result(self._lease(proxy))
+
+    def _add_available(self, proxy: str) -> None:
+        if proxy in self._positions:
+            return
+
+        self._positions[proxy] = len(self._available)
+        self._available.append(proxy)
+
+    def _remove_available(self, proxy: str) -> None:
+        # Swap with the last element so removal never shifts the list
+        index = self._positions.pop(proxy, None)
+        if index is None:
+            return
+
+        last = self._available.pop()
+        if index < len(self._available):
+            self._available[index] = last
+            self._positions[last] = index
+
+    def report(self, proxy: Proxy | str, success: bool, latency: float = None) -> None:
+        health = self.health.get(self._key(proxy))
+        if health is None:
+            return
+
+        if latency is not None:
+            health.latency = latency if health.latency is None else self.alpha * latency + (1 - self.alpha) * health.latency
+
+        health.success_rate = self.alpha * (1.0 if success else 0.0) + (1 - self.alpha) * health.success_rate
+        if success:
+            health.failures = 0
+            return
+
+        health.failures += 1
+        if health.failures >= self.quarantine_after_failures:
+            # Every failure past the threshold doubles the quarantine time
+            quarantine_time = min(
+                self.quarantine_base_time * 2 ** (health.failures - self.quarantine_after_failures),
+                self.quarantine_max_time,
+            )
+            health.quarantined_until = time.monotonic() + quarantine_time
+            logger.debug(f"Proxy {proxy} quarantined for {quarantine_time:.0f}s after {health.failures} failures")
+
+    def _select(self) -> Optional[str]:
+        if not self._available:
+            return None
+
+        if len(self._available) <= self.FULL_SCAN_LIMIT:
+            candidates = self._available
+        else:
+            candidates = [random.choice(self._available) for _ in range(self.SAMPLE_SIZE)]
+
+        healthy = [proxy for proxy in candidates if not self.health[proxy].quarantined]
+        if healthy:
+            return max(healthy, key=lambda proxy: self.health[proxy].score)
+
+        # Every candidate is quarantined, take the one that gets out first instead of stalling
+        return min(candidates, key=lambda proxy: self.health[proxy].quarantined_until)
+
+    def _lease(self, proxy: str) -> str:
+        self._leases[proxy] = self._leases.get(proxy, 0) + 1
+        if self.max_leases_per_proxy and self._leases[proxy] >= self.max_leases_per_proxy:
+            self._remove_available(proxy)
+        return proxy
+
+    def lease(self, proxy: Proxy | str) -> bool:
+        proxy = self._key(proxy)
+
+        health = self.health.get(proxy)
+        if health is None or health.quarantined or proxy not in self._positions:
+            return False
+
+        self._lease(proxy)
+        return True
+
+    async def get_proxy(self, timeout: float = None) -> str:
+        timeout = timeout if timeout is not None else self.wait_timeout
+
+        # Timed out and cancelled waiters are otherwise only dropped by release_proxy
+        while self._waiters and self._waiters[0].done():
+            self._waiters.popleft()
+
+        # Queued callers are served first, a newcomer may not overtake them
+        if not self._waiters:
+            proxy = self._select()
+            if proxy is not None:
+                return self._lease(proxy)
+
+            logger.warning("No available proxies, waiting for a proxy to be released..")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                return waiter.result()
+            raise NoAvailableProxies(f"No proxy was released within {timeout} seconds")
+        except asyncio.CancelledError:
+            # The proxy may have been handed over right before the cancellation
+            if waiter.done() and not waiter.cancelled():
+                await self.release_proxy(waiter.result())
+            raise
 
     async def release_proxy(self, proxy: Proxy | str) -> None:
-        async with self.lock:
-            self.proxies.append(proxy)
-            if proxy in self.active_proxies:
-                self.active_proxies.remove(proxy)
+        proxy = self._key(proxy)
+
+        leases = self._leases.get(proxy)
+        if not leases:
+            return
+
+        if leases > 1:
+            self._leases[proxy] = leases - 1
+        else:
+            del self._leases[proxy]
+
+        if proxy not in self.health or proxy in self._positions:
+            return
+
+        # Hand the proxy straight to the longest waiting caller, cancelled and
+        # timed out waiters are dropped from the queue here
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(self._lease(proxy))
+                return
+
+        self._add_available(proxy)
 
     async def remove_proxy(self, proxy: Proxy | str) -> bool:
-        async with self.lock:
-            try:
-                self.proxies.remove(proxy)
-                if proxy in self.active_proxies:
-                    self.active_proxies.remove(proxy)
-
-                return True
-            except ValueError:
-                return False
+        proxy = self._key(proxy)
+        if proxy not in self.health:
+            return False
+
+        self._remove_available(proxy)
+        self._leases.pop(proxy, None)
+        del self.health[proxy]
+        return True
@@ -0,0 +1,3 @@
+from .metrics import *
+from .tracing import *
+from .profiling import *
@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import tracemalloc
+
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from loguru import logger
+
+from .metrics import registry
+
+try:
+    import yappi
+except ImportError:
+    yappi = None
+
+
+loop_lag_seconds = registry.histogram(
+    "irys_loop_lag_seconds",
+    "How late event loop timers fire",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+
+def _timestamp() -> str:
+    return datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+
+
+class CPUProfiler:
+    # yappi follows coroutines across awaits and can measure wall time. cProfile is not a fallback:
+    # it charges every await to the wrong frame and slows the bot down too much to be representative.
+    # Stats are saved in pstats format, one file per module run
+    def __init__(self, output_dir: Path, clock: str = "wall"):
+        if yappi is None:
+            raise RuntimeError("CPU profiling requires yappi, install it with: pip install yappi")
+
+        self.output_dir = output_dir
+        self.clock = clock
+
+    def start(self) -> None:
+        yappi.set_clock_type(self.clock)
+        yappi.start()
+
+    def stop(self, label: str) -> Path:
+        path = self.output_dir / f"cpu_{label}_{_timestamp()}.pstats"
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        yappi.stop()
+        yappi.get_func_stats().save(str(path), type="pstat")
+        yappi.clear_stats()
+
+        return path
+
+
+class MemorySnapshots:
+    def __init__(self, output_dir: Path, interval: float = 60.0, top: int = 25):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.top = top
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        tracemalloc.start()
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.snapshot()
+
+    def snapshot(self) -> None:
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+
+        if self._previous is not None:
+            stats = snapshot.compare_to(self._previous, "lineno")
+            title = "Growth since the previous snapshot"
+        else:
+            stats = snapshot.statistics("lineno")
+            title = "Largest allocations"
+        self._previous = snapshot
+
+        current, peak = tracemalloc.get_traced_memory()
+        path = self.output_dir / f"memory_{_timestamp()}.txt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            f"Traced: {current / 1024 / 1024:.1f} MiB | Peak: {peak / 1024 / 1024:.1f} MiB\n{title}:\n"
+            + "\n".join(str(stat) for stat in stats[:self.top]) + "\n",
+            encoding="utf-8",
+        )
+        logger.debug(f"Memory snapshot saved to {path} | Traced: {current / 1024 / 1024:.1f} MiB")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+        self.snapshot()
+        tracemalloc.stop()
+
+
+class LoopLagMonitor:
+    # A timer is scheduled every `interval`, the difference between the planned and the actual
+    # firing time is the time the loop was busy with something else
+    def __init__(self, interval: float = 0.5, threshold: float = 0.1):
+        self.interval = interval
+        self.threshold = threshold
+        self.max_lag = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._schedule()
+
+    def _schedule(self) -> None:
+        expected = self._loop.time() + self.interval
+        self._handle = self._loop.call_at(expected, self._check, expected)
+
+    def _check(self, expected: float) -> None:
+        lag = max(self._loop.time() - expected, 0.0)
+        loop_lag_seconds.observe(lag)
+        self.max_lag = max(self.max_lag, lag)
+
+        if lag >= self.threshold:
+            logger.warning(f"Event loop lag: timer fired {lag * 1000:.0f}ms late")
+
+        self._schedule()
+
+    def stop(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+            logger.info(f"Event loop lag | Max: {self.max_lag * 1000:.0f}ms")
+
+
+class _AsyncioLogHandler(logging.Handler):
+    # Loop debug mode reports slow callbacks through the stdlib "asyncio" logger
+    def emit(self, record: logging.LogRecord) -> None:
+        logger.warning(f"asyncio: {record.getMessage()}")
+
+
+class RuntimeProfiler:
+    # Every part is opt-in, nothing is created or scheduled for the switched off ones
+    def __init__(
+        self,
+        cpu_profile: bool = False,
+        profile_clock: str = "wall",
+        memory_snapshots: bool = False,
+        memory_interval: float = 60.0,
+        loop_lag_monitor: bool = False,
+        lag_interval: float = 0.5,
+        lag_threshold: float = 0.1,
+        loop_debug: bool = False,
+        slow_callback_duration: float = 0.1,
+        output_dir: str = "./results/profiles",
+    ):
+        output = Path(output_dir)
+        self.cpu = CPUProfiler(output, profile_clock) if cpu_profile else None
+        self.memory = MemorySnapshots(output, memory_interval) if memory_snapshots else None
+        self.lag = LoopLagMonitor(lag_interval, lag_threshold) if loop_lag_monitor else None
+        self.loop_debug = loop_debug
+        self.slow_callback_duration = slow_callback_duration
+
+    def start(self) -> None:
+        if self.loop_debug:
+            loop = asyncio.get_running_loop()
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.slow_callback_duration
+
+            # The handler stays for the rest of the process, the loop reports until asyncio.run returns
+            logging.getLogger("asyncio").addHandler(_AsyncioLogHandler(logging.WARNING))
+
+        if self.lag is not None:
+            self.lag.start()
+
+        if self.memory is not None:
+            self.memory.start()
+
+    @contextmanager
+    def module_run(self, module_name: str) -> Iterator[None]:
+        if self.cpu is None:
+            yield
+            return
+
+        self.cpu.start()
+        try:
+            yield
+        finally:
+            path = self.cpu.stop(module_name)
+            logger.info(f"CPU profile saved to {path}")
+
+    async def stop(self) -> None:
+        if self.memory is not None:
+            await self.memory.stop()
+
+        if self.lag is not None:
+            self.lag.stop()
@@ -0,0 +1,163 @@
+import asyncio
+import itertools
+import json
+import os
+import random
+import time
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+@dataclass(slots=True)
+class TraceState:
+    tid: int
+    sampled: bool
+    label: str = ""
+    # Task that owns the timeline row, spans from other tasks of the same account get their own row
+    owner: Optional[asyncio.Task] = None
+    lanes: int = 0
+
+
+def _current_task() -> Optional[asyncio.Task]:
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
+
+
+_current_trace: ContextVar[Optional[TraceState]] = ContextVar("current_trace", default=None)
+
+
+class Tracer:
+    # Spans are kept as Chrome trace events ("X" complete events), every account gets its own
+    # timeline row, so nesting on a row shows the parent/child structure of its operations.
+    # "X" events on one row must nest, so concurrent tasks of an account (hedged captchas,
+    # games completed together) each get an extra row placed under the account's one.
+    # Sampling is decided once per account, unsampled accounts cost one context lookup per span
+    def __init__(self, enabled: bool = False, sample_rate: float = 1.0, max_events: int = 500_000):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.max_events = max_events
+
+        self._pid = os.getpid()
+        self._origin = time.monotonic()
+        self._events: list[dict] = []
+        self._dropped = 0
+        self._tids = itertools.count(1)
+
+    def configure(self, enabled: bool, sample_rate: float = 1.0, max_events: int = None) -> None:
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        if max_events is not None:
+            self.max_events = max_events
+
+    @property
+    def events_count(self) -> int:
+        return len(self._events)
+
+    def _timestamp(self, moment: float) -> float:
+        return round((moment - self._origin) * 1_000_000, 1)
+
+    def _append(self, event: dict) -> None:
+        if len(self._events) >= self.max_events:
+            self._dropped += 1
+            return
+        self._events.append(event)
+
+    def _name_row(self, tid: int, label: str, sort_index: int) -> None:
+        self._append({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": label}})
+        self._append({"name": "thread_sort_index", "ph": "M", "pid": self._pid, "tid": tid, "args": {"sort_index": sort_index}})
+
+    def _sampled_state(self) -> Optional[TraceState]:
+        state = _current_trace.get()
+        if state is None or not state.sampled:
+            return None
+
+        task = _current_task()
+        if task is state.owner:
+            return state
+
+        # A task started inside the account's trace inherits its state, it gets its own row
+        # and keeps it for the rest of the task because the context variable is per task
+        state.lanes += 1
+        lane = TraceState(tid=next(self._tids), sampled=True, label=state.label, owner=task)
+        self._name_row(lane.tid, f"{state.label} [{state.lanes}]", state.tid * 1000 + state.lanes)
+        _current_trace.set(lane)
+        return lane
+
+    def _complete(self, state: TraceState, name: str, category: str, started: float, duration: float, args: dict) -> None:
+        self._append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": self._timestamp(started),
+            "dur": round(duration * 1_000_000, 1),
+            "pid": self._pid,
+            "tid": state.tid,
+            "args": args,
+        })
+
+    @contextmanager
+    def trace(self, label: str, name: str, category: str = "account", **args) -> Iterator[Optional[TraceState]]:
+        # Root of an account timeline, `label` names the row in the viewer
+        if not self.enabled:
+            yield None
+            return
+
+        state = TraceState(
+            tid=next(self._tids),
+            sampled=random.random() < self.sample_rate,
+            label=label,
+            owner=_current_task(),
+        )
+        token = _current_trace.set(state)
+
+        if state.sampled:
+            self._name_row(state.tid, label, state.tid * 1000)
+
+        try:
+            with self.span(name, category, **args):
+                yield state
+        finally:
+            _current_trace.reset(token)
+
+    @contextmanager
+    def span(self, name: str, category: str = "task", **args) -> Iterator[None]:
+        state = self._sampled_state()
+        if state is None:
+            yield
+            return
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._complete(state, name, category, started, time.monotonic() - started, args)
+
+    def add_span(self, name: str, category: str, started: float, duration: float, **args) -> None:
+        # For code that already measures itself with time.monotonic()
+        state = self._sampled_state()
+        if state is not None:
+            self._complete(state, name, category, started, duration, args)
+
+    def dump(self, path: Path | str) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "traceEvents": self._events,
+                    "displayTimeUnit": "ms",
+                    "otherData": {"sample_rate": self.sample_rate, "dropped_events": self._dropped},
+                },
+                file,
+                separators=(",", ":"),
+            )
+
+
+tracer = Tracer()
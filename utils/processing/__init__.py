@@ -1,3 +1,4 @@
 from .handlers import *
 from .progress import *
 from .generators import *
+from .reports import *
@@ -1,3 +1,10 @@
+import time
+
+from collections import Counter, deque
+from typing import Optional
+
+from .reports import TaskReport
+
 
 class WebSocketStats:
     def __init__(self, ws_counter):
@@ -16,12 +23,68 @@ class WebSocketStats:
 
 
 class Progress:
-    def __init__(self, total: int):
-        self.processed = 0
+    # Accounts finished per module run, throughput is measured over a sliding window
+    def __init__(self, total: int, window: float = 60.0):
         self.total = total
+        self.window = window
+        self.processed = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.tasks: dict[str, list[int]] = {}
+        self.errors: Counter = Counter()
+        self.started_at = time.monotonic()
+        self._finished_at: deque[float] = deque()
 
-    def increment(self):
+    def increment(self, success: bool = True):
         self.processed += 1
+        if success:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        self._finished_at.append(time.monotonic())
+
+    def record(self, reports: list[TaskReport], error: BaseException = None):
+        # The account succeeded when every operation it started (not the nested ones) succeeded
+        operations = [report for report in reports if report.parent is None]
+        success = error is None and bool(operations) and all(report.status == "success" for report in operations)
+
+        for report in reports:
+            counts = self.tasks.setdefault(report.task, [0, 0])
+            if report.status == "success":
+                counts[0] += 1
+            else:
+                counts[1] += 1
+                if report.error_class:
+                    self.errors[report.error_class] += 1
+
+        if error is not None:
+            self.errors[type(error).__name__] += 1
+
+        self.increment(success)
+
+    def throughput(self) -> float:
+        # Accounts per minute
+        now = time.monotonic()
+        while self._finished_at and now - self._finished_at[0] > self.window:
+            self._finished_at.popleft()
+
+        elapsed = min(self.window, now - self.started_at)
+        return len(self._finished_at) / elapsed * 60 if elapsed > 0 else 0.0
+
+    def eta(self) -> Optional[float]:
+        remaining = self.total - self.processed
+        if remaining <= 0:
+            return 0.0
+
+        throughput = self.throughput()
+        return remaining / throughput * 60 if throughput > 0 else None
+
+    def top_errors(self, limit: int = 5) -> list[tuple[str, int]]:
+        return self.errors.most_common(limit)
 
     def reset(self):
-        self.processed = 0
+        self.processed = self.succeeded = self.failed = 0
+        self.tasks = {}
+        self.errors = Counter()
+        self.started_at = time.monotonic()
+        self._finished_at.clear()
@@ -0,0 +1,125 @@
+import time
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Callable, Iterator, Optional
+
+from utils.monitoring.metrics import retries_total
+from utils.monitoring.tracing import tracer
+
+
+@dataclass
+class TaskReport:
+    task: str
+    wallet_address: str
+    proxy: Optional[str] = None
+    status: str = "running"
+    attempts: int = 0
+    error_class: Optional[str] = None
+    error: Optional[str] = None
+    tx_hashes: list[str] = field(default_factory=list)
+    stages: dict[str, float] = field(default_factory=dict)
+    started_at: float = field(default_factory=time.time)
+    duration: float = 0.0
+    parent: Optional["TaskReport"] = field(default=None, repr=False, compare=False)
+
+    @property
+    def tx_hash(self) -> Optional[str]:
+        return self.tx_hashes[-1] if self.tx_hashes else None
+
+    @property
+    def captcha_time(self) -> float:
+        return self.stages.get("captcha", 0.0)
+
+    @property
+    def rpc_time(self) -> float:
+        return self.stages.get("rpc", 0.0)
+
+    def to_record(self) -> dict:
+        return {
+            "task": self.task,
+            "status": self.status,
+            "error_class": self.error_class,
+            "error": self.error,
+            "tx_hashes": self.tx_hashes,
+            "attempts": self.attempts,
+            "proxy": self.proxy,
+            "started_at": round(self.started_at, 3),
+            "duration": round(self.duration, 4),
+            "stages": {
+                stage: round(self.stages.get(stage, 0.0), 4)
+                for stage in ("captcha", "rpc", "api", "confirmation")
+            },
+        }
+
+
+_current_report: ContextVar[Optional[TaskReport]] = ContextVar("current_task_report", default=None)
+
+
+def current_report() -> Optional[TaskReport]:
+    return _current_report.get()
+
+
+@contextmanager
+def task_report(task: str, wallet_address: str) -> Iterator[TaskReport]:
+    report = TaskReport(task=task, wallet_address=wallet_address, parent=_current_report.get())
+    token = _current_report.set(report)
+    started = time.monotonic()
+
+    try:
+        yield report
+    except BaseException as error:
+        report.status = "error"
+        note_error(error)
+        raise
+    finally:
+        report.duration = time.monotonic() - started
+        _current_report.reset(token)
+
+
+def add_stage_time(stage: str, seconds: float) -> None:
+    # Nested operations (all in one) also count towards the operation that started them
+    report = _current_report.get()
+    while report is not None:
+        report.stages[stage] = report.stages.get(stage, 0.0) + seconds
+        report = report.parent
+
+
+def note_attempt(proxy: str = None) -> None:
+    report = _current_report.get()
+    if report is not None:
+        report.attempts += 1
+        report.proxy = proxy or report.proxy
+        if report.attempts > 1:
+            retries_total.inc(task=report.task)
+
+
+def note_error(error: BaseException) -> None:
+    report = _current_report.get()
+    if report is not None:
+        report.error_class = type(error).__name__
+        report.error = str(error)
+
+
+def note_tx_hash(tx_hash: str) -> None:
+    report = _current_report.get()
+    if report is not None and tx_hash:
+        report.tx_hashes.append(tx_hash)
+
+
+def reported_task(task: str) -> Callable:
+    # Wraps a Bot operation, the report is kept on the bot once the operation returns
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            with task_report(task, self.account_data.wallet_address) as report, tracer.span(task, "task"):
+                self.reports.append(report)
+                result = await func(self, *args, **kwargs)
+                report.status = "success" if result and result.get("status") else "failed"
+                return result
+
+        return wrapper
+
+    return decorator